@@ -1,7 +1,20 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import os
+import signal
 import time
 import random
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from listing_parser import Listing, parse_search_page, BACKENDS, DEFAULT_BACKEND
+from http_cache import get_session, ResponseCache, DEFAULT_CACHE_DIR, DEFAULT_TTL
+from listings_store import ListingsStore, DEFAULT_STORE_PATH
+from strategies import StrategyManager, DEFAULT_STATS_PATH, SUCCESS, CAPTCHA, ERROR
+from scanner import run_scan, emit, HostThrottle, DEFAULT_CONCURRENCY, DEFAULT_RATE, DEFAULT_BURST
+from writers import open_writer
+from metrics import metrics, profile_call, DEFAULT_PROFILE_PATH
+from watch import Watcher, CommandHook, TelegramHook, log, DEFAULT_INTERVAL, DEFAULT_JITTER, FAILURE_ALERT_AFTER
 
 # More realistic browser headers
 HEADERS = {
@@ -18,60 +31,169 @@ HEADERS = {
     "Cache-Control": "max-age=0"
 }
 
+# Header sets tried in order until one gets past the CAPTCHA
+STRATEGIES = [
+    # Strategy 1: Normal request
+    ("default", HEADERS),
+    # Strategy 2: Different User-Agent
+    ("windows-ua", {**HEADERS, "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}),
+    # Strategy 3: Without some headers
+    ("no-sec-fetch", {k: v for k, v in HEADERS.items() if k not in ["Sec-Fetch-Dest", "Sec-Fetch-Mode", "Sec-Fetch-Site"]}),
+]
+
 ROOM_TYPES = {
     1: "1-Bedroom",
     2: "2-Bedroom",
     3: "3-Bedroom",
 }
 
-BASE_URL = "https://www.wasl.ae/en/search/residential"
+# WASL_BASE_URL points the checker somewhere else, e.g. benchmarks/fixture_server.py
+BASE_URL = os.environ.get("WASL_BASE_URL", "https://www.wasl.ae/en/search/residential")
 LOCATION = "muhaisnah-fourth"
+# Locations scanned by main(); each one is combined with every room type
+LOCATIONS = [LOCATION]
+PARSER_BACKEND = DEFAULT_BACKEND
+
+# Pagination: query parameter, pages fetched at once per job, and a safety cap
+PAGE_PARAM = "page"
+PAGE_CONCURRENCY = 3
+MAX_PAGES = 20
+
+# Seconds to wait for a connection, and for the server between bytes of a
+# response, before the request counts as an error
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+
+def location_name(location):
+    return location.replace('-', ' ').title()
+
+def format_price(price):
+    return f"{price:,}" if price is not None else "N/A"
+
+def format_listing(listing):
+    return f"- {listing.building} (Unit {listing.unit_no}): {format_price(listing.price)} AED/Year - {listing.location}"
+
+def empty_result(location, room, complete=True):
+    return {
+        'location': location,
+        'room_type': ROOM_TYPES[room],
+        'count': 0,
+        'listings': [],
+        'complete': complete
+    }
+
+class PageFetchError(Exception):
+    pass
+
+# Parsed pages are cached as JSON, so Listing records go through plain dicts
+def page_to_dict(cards, page_count):
+    return {
+        'cards': None if cards is None else [asdict(card) for card in cards],
+        'pages': page_count
+    }
 
-def check_listings(room):
+def page_from_dict(data):
+    cards = None if data['cards'] is None else [Listing(**card) for card in data['cards']]
+    return cards, data['pages']
+
+def fetch_page(room, location=LOCATION, page=1, throttle=None, cache=None, backend=PARSER_BACKEND, manager=None,
+               timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+    """Fetch and parse one page of search results.
+
+    Returns (cards, page_count), where cards is None if the page had no
+    listings container, or None if the page couldn't be fetched.
+    """
     params = {
         "sortfield": "Price",
         "order": "Asc",
-        "location": LOCATION,
+        "location": location,
         "room": room,
         "view": "grid"
     }
+    if page > 1:
+        params[PAGE_PARAM] = page
 
-    # Add random delay before request (1-3 seconds)
-    time.sleep(random.uniform(1, 3))
-    
-    # Try multiple strategies
-    strategies = [
-        # Strategy 1: Normal request
-        lambda: requests.get(BASE_URL, headers=HEADERS, params=params),
-        # Strategy 2: Different User-Agent
-        lambda: requests.get(BASE_URL, headers={**HEADERS, "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}, params=params),
-        # Strategy 3: Without some headers
-        lambda: requests.get(BASE_URL, headers={k: v for k, v in HEADERS.items() if k not in ["Sec-Fetch-Dest", "Sec-Fetch-Mode", "Sec-Fetch-Site"]}, params=params)
-    ]
-    
+    host = urlparse(BASE_URL).netloc
+    if manager and not manager.allow(host):
+        emit(f"⛔ Skipping {ROOM_TYPES[room]}: {host} keeps blocking us, waiting for the cooldown.")
+        return None
+
+    # Try multiple strategies, best observed success rate first
+    strategies = manager.ordered() if manager else STRATEGIES
     response = None
-    for i, strategy in enumerate(strategies):
+    cache_key = None
+
+    def record(name, outcome, latency):
+        if manager:
+            manager.record(name, host, outcome, latency)
+        metrics.observe("fetch", latency, strategy=name)
+        metrics.count("requests", strategy=name, outcome=outcome)
+
+    for i, (name, headers) in enumerate(strategies):
+        entry = None
+        if cache:
+            cache_key = cache.key(BASE_URL, params, name)
+            entry = cache.get(cache_key)
+            if entry and cache.is_fresh(entry):
+                metrics.count("cache", result="fresh")
+                return page_from_dict(entry["result"])
+            headers = {**headers, **cache.conditional_headers(entry)}
+
+        # Wait for the per-host politeness budget, or fall back to a
+        # random delay (1-3 seconds) when called without a throttle
+        if throttle:
+            with metrics.timer("sleep", reason="throttle"):
+                throttle.acquire(BASE_URL)
+        else:
+            with metrics.timer("sleep", reason="delay"):
+                time.sleep(random.uniform(1, 3))
+        delay = manager.backoff_delay(host) if manager else 0
+        if delay:
+            with metrics.timer("sleep", reason="backoff"):
+                time.sleep(delay)
+        start = time.perf_counter()
         try:
-            response = strategy()
-            
-            if response.status_code == 200:
+            response = get_session().get(BASE_URL, headers=headers, params=params, timeout=timeout)
+            latency = time.perf_counter() - start
+
+            if response.status_code == 304 and entry:
+                # Page unchanged since the last run, reuse the parsed cards
+                record(name, SUCCESS, latency)
+                metrics.count("cache", result="not_modified")
+                cache.refresh(cache_key, entry)
+                return page_from_dict(entry["result"])
+            elif response.status_code == 200:
+                # Bytes read off the wire, before any gzip/br decoding. urllib3
+                # doesn't count chunked bodies, so those fall back to the decoded size
+                metrics.count("bytes", response.raw.tell() or len(response.content), strategy=name)
                 # Check if we got a CAPTCHA page
                 if "Radware Captcha Page" in response.text or "hcaptcha" in response.text.lower():
+                    record(name, CAPTCHA, latency)
                     if i < len(strategies) - 1:  # Try next strategy
-                        print(f"⚠️ CAPTCHA detected for {ROOM_TYPES[room]} (strategy {i+1}), trying next approach...")
-                        time.sleep(random.uniform(2, 5))
+                        emit(f"⚠️ CAPTCHA detected for {ROOM_TYPES[room]} (strategy {name}), trying next approach...")
+                        if manager and not manager.allow(host):
+                            emit(f"⛔ Giving up on {ROOM_TYPES[room]}: {host} keeps blocking us.")
+                            return None
+                        if not manager:
+                            with metrics.timer("sleep", reason="captcha"):
+                                time.sleep(random.uniform(2, 5))
                         continue
                     else:
-                        print(f"⚠️ CAPTCHA detected for {ROOM_TYPES[room]}. All strategies failed.")
+                        emit(f"⚠️ CAPTCHA detected for {ROOM_TYPES[room]}. All strategies failed.")
                         return None
                 else:
+                    record(name, SUCCESS, latency)
                     break  # Success, no CAPTCHA
             else:
-                print(f"❌ Failed to fetch listings for {ROOM_TYPES[room]} (Status: {response.status_code})")
+                # 403 and 429 are how the site turns away clients it has flagged
+                record(name, CAPTCHA if response.status_code in (403, 429) else ERROR, latency)
+                emit(f"❌ Failed to fetch listings for {ROOM_TYPES[room]} (Status: {response.status_code})")
                 return None
-                
+
         except Exception as e:
-            print(f"❌ Error with strategy {i+1} for {ROOM_TYPES[room]}: {e}")
+            response = None
+            record(name, ERROR, time.perf_counter() - start)
+            emit(f"❌ Error with strategy {name} for {ROOM_TYPES[room]}: {e}")
             if i < len(strategies) - 1:
                 continue
             else:
@@ -80,148 +202,504 @@ def check_listings(room):
     if not response or response.status_code != 200:
         return None
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    
-    # Try different container selectors
-    container = None
-    container_selectors = [
-        "div.all-units-section.cs_search_card.search-content",
-        "div.all-units-section",
-        "div.search-content"
-    ]
-    
-    for selector in container_selectors:
-        container = soup.select_one(selector)
-        if container:
-            break
-    
-    if not container:
-        print(f"⚠️ Could not find listings container for {ROOM_TYPES[room]}. The page structure may have changed.")
-        return None
+    with metrics.timer("parse", backend=backend):
+        cards, page_count = parse_search_page(response.text, backend)
+    if cache:
+        cache.put(cache_key, response, page_to_dict(cards, page_count))
+    return cards, page_count
 
-    # Look for listings first, regardless of "no search found" message
-    listings = container.find_all("section", class_="all-units-cards")
-    
-    if not listings:
-        # Only show "no search found" if there are actually no listings
-        no_results = container.find("section", class_="no-search-found")
-        if no_results:
-            print(f"❌ No {ROOM_TYPES[room]} listings found in {LOCATION.replace('-', ' ').title()}")
+def iter_cards(first_cards, page_count, fetch, page_pool=None, page_concurrency=PAGE_CONCURRENCY,
+               stop_after=None, stopped=None):
+    """Yield the cards of every results page, starting with the first.
+
+    Pages after the first are fetched with fetch(page), page_concurrency at
+    a time on page_pool, or one at a time on the calling thread without a
+    pool. Each page's cards are yielded as soon as its turn comes, so only
+    one wave of pages is held in memory. No further waves are fetched once
+    stop_after(cards) is true for a page. When that leaves pages unread,
+    stopped.append(page) records where it happened.
+    """
+    yield from first_cards
+    if stop_after and stop_after(first_cards):
+        if stopped is not None and page_count > 1:
+            stopped.append(1)
+        return
+
+    wave_size = page_concurrency if page_pool else 1
+    for wave_start in range(2, page_count + 1, wave_size):
+        wave = range(wave_start, min(wave_start + wave_size, page_count + 1))
+        if page_pool:
+            futures = [page_pool.submit(fetch, page) for page in wave]
+            results = (future.result() for future in futures)
         else:
-            print(f"❌ No {ROOM_TYPES[room]} listings found in {LOCATION.replace('-', ' ').title()}")
+            futures = []
+            results = (fetch(page) for page in wave)
+        stop = None
+        try:
+            for page, parsed in zip(wave, results):
+                if parsed is None or parsed[0] is None:
+                    raise PageFetchError(f"page {page} of {page_count} could not be read")
+                cards = parsed[0]
+                yield from cards
+                if stop is None and stop_after and stop_after(cards):
+                    stop = page
+        finally:
+            # Don't leave queued pages of an abandoned job on the shared pool
+            for future in futures:
+                future.cancel()
+        if stop is not None:
+            # The rest of the wave was already read, so only later waves are skipped
+            if stopped is not None and wave[-1] < page_count:
+                stopped.append(stop)
+            return
+
+# Card types accepted for each requested room type
+ROOM_MATCHES = {
+    1: ("1 bedroom", "studio"),
+    2: ("2 bedroom", "2 room"),
+    3: ("3 bedroom", "3 room"),
+}
+
+def listing_matcher(room, location=LOCATION):
+    # Only keep listings from the specified location AND correct room type
+    wanted_location = location.replace('-', ' ').lower()
+    room_matches = ROOM_MATCHES.get(room, ())
+
+    def matches(card):
+        card_location = card.location.lower() if card.location != "N/A" else ""
+        location_match = wanted_location in card_location or card_location in wanted_location
+        card_type = card.type.lower()
+        return location_match and any(match in card_type for match in room_matches)
+    return matches
+
+def filter_listings(cards, room, location=LOCATION):
+    matches = listing_matcher(room, location)
+    seen = set()
+    # Only the matching itself is timed; pulling cards may fetch and parse pages
+    timing = metrics.enabled
+    filter_time = 0.0
+    cards_seen = 0
+    try:
+        for card in cards:
+            start = time.perf_counter() if timing else 0.0
+            # A unit can shift onto the next page while we're paging through
+            key = (card.building, card.unit_no)
+            matched = key not in seen and matches(card)
+            if timing:
+                filter_time += time.perf_counter() - start
+                cards_seen += 1
+            if matched:
+                seen.add(key)
+                yield card
+    finally:
+        if timing:
+            metrics.observe("filter", filter_time)
+            metrics.count("cards_seen", cards_seen)
+            metrics.count("cards_matched", len(seen))
+
+def make_result(location, room, listings, complete=True):
+    if not listings:
+        return empty_result(location, room, complete)
+    return {
+        'location': location,
+        'room_type': ROOM_TYPES[room],
+        'count': len(listings),
+        'listings': listings,
+        'complete': complete
+    }
+
+def check_listings(room, location=LOCATION, throttle=None, cache=None, backend=PARSER_BACKEND, manager=None,
+                   known=None, page_pool=None, page_concurrency=PAGE_CONCURRENCY, max_pages=MAX_PAGES,
+                   timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+    def fetch(page):
+        return fetch_page(room, location, page, throttle, cache, backend, manager, timeout)
+
+    first = fetch(1)
+    if first is None:
         return None
-    
-    # Filter listings to only show those from the specified location AND correct room type
-    filtered_listings = []
-    for listing in listings:
-        # Get location from the card details
-        location_elem = listing.find("div", class_="card-details")
-        location_text = ""
-        room_type_text = ""
-        
-        if location_elem:
-            span = location_elem.find("span")
-            if span:
-                location_text = span.get_text(strip=True)
-        
-        # Get room type from card details
-        card_details = listing.find_all("div", class_="card-details")
-        for detail in card_details:
-            span = detail.find("span")
-            if span:
-                text = span.get_text(strip=True)
-                if "Type:" in text:
-                    room_type_i = span.find("i")
-                    if room_type_i:
-                        room_type_text = room_type_i.get_text(strip=True).lower()
-                        break
-        
-        # Check if this listing is from the specified location AND matches the requested room type
-        location_match = LOCATION.replace('-', ' ').lower() in location_text.lower() or location_text.lower() in LOCATION.replace('-', ' ').lower()
-        
-        # Check room type match
-        room_match = False
-        if room == 1:
-            room_match = "1 bedroom" in room_type_text or "studio" in room_type_text
-        elif room == 2:
-            room_match = "2 bedroom" in room_type_text or "2 room" in room_type_text
-        elif room == 3:
-            room_match = "3 bedroom" in room_type_text or "3 room" in room_type_text
-        
-        if location_match and room_match:
-            filtered_listings.append(listing)
-
-    if filtered_listings:
-        result_lines = []
-        for listing in filtered_listings:
-            # Get building name from h3 tag
-            title_elem = listing.find("h3")
-            title = title_elem.get_text(strip=True) if title_elem else "N/A"
-            
-            # Get all card-details divs to find price and unit number
-            card_details = listing.find_all("div", class_="card-details")
-            price = "N/A"
-            unit_no = "N/A"
-            location = "N/A"
-            
-            for detail in card_details:
-                span = detail.find("span")
-                if span:
-                    text = span.get_text(strip=True)
-                    if "Price" in text:
-                        price_i = span.find("i")
-                        if price_i:
-                            # Clean up the price text
-                            price_text = price_i.get_text(strip=True)
-                            price = price_text.replace('\n', '').replace('/', '').replace('Year', '').strip()
-                    elif "Unit No." in text:
-                        unit_i = span.find("i")
-                        if unit_i:
-                            unit_no = unit_i.get_text(strip=True)
-                    elif not any(keyword in text for keyword in ["Price", "Unit No.", "Size", "Type", "Parking"]):
-                        # This is likely the location
-                        location = text
-            
-            listing_text = f"- {title} (Unit {unit_no}): {price} AED/Year - {location}"
-            result_lines.append(listing_text)
-        
-        return {
-            'room_type': ROOM_TYPES[room],
-            'count': len(filtered_listings),
-            'listings': result_lines
-        }
-    else:
+    cards, page_count = first
+
+    if cards is None:
+        emit(f"⚠️ Could not find listings container for {ROOM_TYPES[room]}. The page structure may have changed.")
         return None
 
-def main():
-    all_results = []
-    
-    for room in ROOM_TYPES:
-        result = check_listings(room)
-        
-        if result:
-            all_results.append(result)
-        else:
-            all_results.append({
-                'room_type': ROOM_TYPES[room],
-                'count': 0,
-                'listings': []
-            })
-        
-        # Add longer delay between requests (15-20 seconds)
-        if room < max(ROOM_TYPES.keys()):
-            delay = random.uniform(15, 20)
-            time.sleep(delay)
-    
-    # Print final results
+    if not cards:
+        emit(f"❌ No {ROOM_TYPES[room]} listings found in {location_name(location)}")
+        return empty_result(location, room)
+
+    # For incremental scans, stop paging once a page only has units we've seen
+    stop_after = None
+    if known is not None:
+        matches = listing_matcher(room, location)
+
+        def stop_after(page_cards):
+            matched = [card for card in page_cards if matches(card)]
+            return bool(matched) and all((card.building, card.unit_no) in known for card in matched)
+
+    # Cards stream page by page through parsing and filtering
+    stopped = []
+    pages = iter_cards(cards, min(page_count, max_pages), fetch, page_pool, page_concurrency, stop_after, stopped)
+    try:
+        listings = list(filter_listings(pages, room, location))
+    except PageFetchError as e:
+        emit(f"❌ Incomplete results for {ROOM_TYPES[room]} in {location_name(location)}: {e}")
+        return None
+    if page_count > max_pages:
+        emit(f"⚠️ Only read {max_pages} of {page_count} pages for {ROOM_TYPES[room]} in {location_name(location)}")
+    return make_result(location, room, listings, complete=not stopped and page_count <= max_pages)
+
+def print_results(all_results):
     for result in all_results:
-        print(f"\n🏠 {result['room_type']} Listings in {LOCATION.replace('-', ' ').title()}:")
+        print(f"\n🏠 {result['room_type']} Listings in {location_name(result['location'])}:")
         if result['count'] > 0:
             print(f"✅ {result['count']} listing(s) found!")
             for listing in result['listings']:
-                print(listing)
+                print(format_listing(listing))
         else:
             print("❌ No listings available in the specified location.")
 
+def diff_lines(diffs):
+    lines = []
+    for diff in diffs:
+        if not (diff['added'] or diff['removed'] or diff['changed']):
+            continue
+        lines.append(f"\n🏠 {ROOM_TYPES[diff['room']]} changes in {location_name(diff['location'])}:")
+        if diff['added']:
+            lines.append(f"✅ {len(diff['added'])} new listing(s) found!")
+            lines.extend(format_listing(listing) for listing in diff['added'])
+        if diff['changed']:
+            lines.append(f"💸 {len(diff['changed'])} price change(s):")
+            for listing, old_price in diff['changed']:
+                lines.append(f"- {listing.building} (Unit {listing.unit_no}): "
+                             f"{format_price(old_price)} → {format_price(listing.price)} AED/Year - {listing.location}")
+        if diff['removed']:
+            lines.append(f"➖ {len(diff['removed'])} listing(s) no longer available:")
+            lines.extend(format_listing(listing) for listing in diff['removed'])
+    return lines
+
+def print_diffs(diffs, failed=()):
+    lines = diff_lines(diffs)
+    # Failed jobs weren't compared, so "no changes" would hide a blocked scan
+    if not lines and not failed:
+        print("\n😴 No changes since the last scan.")
+    for line in lines:
+        print(line)
+
+def print_failures(failed):
+    if not failed:
+        return
+    print(f"\n🚫 {len(failed)} job(s) failed (CAPTCHA, blocked host or network error) and weren't checked:")
+    for location, room in failed:
+        print(f"- {ROOM_TYPES[room]} in {location_name(location)}")
+
+# A zero rate or burst would leave the token bucket dividing by zero or
+# waiting forever for a token
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def positive_float(value):
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check WASL apartment availability")
+    parser.add_argument("--locations", default=",".join(LOCATIONS),
+                        help="comma-separated location slugs (default: %(default)s)")
+    parser.add_argument("--rooms", default=",".join(str(room) for room in ROOM_TYPES),
+                        help="comma-separated room types (default: %(default)s)")
+    parser.add_argument("--concurrency", type=positive_int, default=DEFAULT_CONCURRENCY,
+                        help="maximum jobs in flight (default: %(default)s)")
+    parser.add_argument("--rate", type=positive_float, default=DEFAULT_RATE,
+                        help="requests per second allowed per host (default: %(default)s)")
+    parser.add_argument("--burst", type=positive_int, default=DEFAULT_BURST,
+                        help="requests allowed back-to-back per host (default: %(default)s)")
+    parser.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT,
+                        help="seconds to wait for a connection to the site (default: %(default)s)")
+    parser.add_argument("--read-timeout", type=float, default=READ_TIMEOUT,
+                        help="seconds to wait for the site to send data before giving up on "
+                             "a request (default: %(default)s)")
+    parser.add_argument("--parser", choices=BACKENDS, default=PARSER_BACKEND,
+                        help="HTML parser backend (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="directory for cached responses (default: %(default)s)")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL,
+                        help="seconds a cached page is reused without revalidating (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always fetch full pages and don't store them")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH,
+                        help="SQLite database of seen listings (default: %(default)s)")
+    parser.add_argument("--no-store", action="store_true",
+                        help="don't record listings; print every listing instead of changes")
+    parser.add_argument("--full", action="store_true",
+                        help="print every listing as well as the changes")
+    parser.add_argument("--page-concurrency", type=int, default=PAGE_CONCURRENCY,
+                        help="workers fetching later result pages, shared by all jobs; 0 fetches "
+                             "them on each job's own thread (default: %(default)s)")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES,
+                        help="most result pages read per job (default: %(default)s)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="stop paging once a page only holds units already in the store")
+    parser.add_argument("--stats", default=DEFAULT_STATS_PATH,
+                        help="file keeping per-strategy success statistics (default: %(default)s)")
+    parser.add_argument("--output", action="append", default=[], metavar="PATH",
+                        help="also write listings to PATH as they arrive; the format follows "
+                             "the extension (.jsonl, .csv or .parquet). Can be repeated")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and poll every job on its own schedule")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="seconds between polls of a job in watch mode (default: %(default)s)")
+    parser.add_argument("--job-interval", action="append", default=[], metavar="LOCATION:ROOM=SECONDS",
+                        help="poll one job on its own interval in watch mode. Can be repeated")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER,
+                        help="random +/- fraction added to each poll interval (default: %(default)s)")
+    parser.add_argument("--hook", action="append", default=[], metavar="COMMAND",
+                        help="in watch mode, run COMMAND with the changes on stdin whenever "
+                             "something changes. Can be repeated")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="write per-stage timings and counters to PATH as JSON")
+    parser.add_argument("--metrics-prom", metavar="PATH",
+                        help="write the same metrics to PATH in Prometheus text format, "
+                             "e.g. for node_exporter's textfile collector")
+    parser.add_argument("--profile-job", metavar="LOCATION:ROOM",
+                        help="run this one job under cProfile, on its own before the rest of the scan, "
+                             "and print where its time went")
+    parser.add_argument("--profile-out", default=DEFAULT_PROFILE_PATH,
+                        help="where --profile-job saves its stats, for snakeviz or pstats (default: %(default)s)")
+    return parser.parse_args()
+
+def parse_job_intervals(values):
+    intervals = {}
+    for value in values:
+        try:
+            job, seconds = value.split("=")
+            location, room = job.rsplit(":", 1)
+            intervals[(location.strip(), int(room))] = float(seconds)
+        except ValueError:
+            raise SystemExit(f"❌ Bad --job-interval {value!r}, expected LOCATION:ROOM=SECONDS")
+    return intervals
+
+def parse_job(value):
+    try:
+        location, room = value.rsplit(":", 1)
+        return location.strip(), int(room)
+    except ValueError:
+        raise SystemExit(f"❌ Bad --profile-job {value!r}, expected LOCATION:ROOM")
+
+def write_metrics(args):
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+    if args.metrics_prom:
+        metrics.write_prometheus(args.metrics_prom)
+
+def watch(args, jobs, check, known, throttle, cache, manager, write_result):
+    store = ListingsStore(args.store)
+    hooks = [CommandHook(command) for command in args.hook]
+    if os.environ.get("TELEGRAM_BOT_TOKEN") and os.environ.get("TELEGRAM_CHAT_ID"):
+        hooks.append(TelegramHook(os.environ["TELEGRAM_BOT_TOKEN"], os.environ["TELEGRAM_CHAT_ID"]))
+
+    # Consecutive failed polls per job, so a site that blocks us doesn't
+    # look like a quiet one
+    failures = {}
+
+    def notify(text):
+        for hook in hooks:
+            hook(text)
+
+    def on_result(job, result):
+        location, room = job
+        metrics.mark_run()
+        name = f"{ROOM_TYPES[room]} in {location_name(location)}"
+        if result is None:
+            failures[job] = failures.get(job, 0) + 1
+            log(f"❌ {name}: poll failed ({failures[job]} in a row)")
+            if failures[job] == FAILURE_ALERT_AFTER:
+                notify(f"❌ {name} has failed {failures[job]} polls in a row, the site may be blocking us")
+            return
+        if failures.pop(job, 0) >= FAILURE_ALERT_AFTER:
+            notify(f"✅ {name} is polling fine again")
+
+        write_result(job, result, None)
+        with metrics.timer("store"):
+            diffs = store.record_scan([(location, room, result['listings'], result['complete'])])
+        if args.incremental:
+            known[job] = set(store.active_units(location, room))
+        lines = diff_lines(diffs)
+        if not lines:
+            log(f"😴 {name}: no changes")
+            return
+        text = "\n".join(lines).strip()
+        log(text)
+        notify(text)
+
+    def maintenance():
+        if cache:
+            cache.evict()
+        manager.save()
+        write_metrics(args)
+
+    watcher = Watcher(
+        jobs, check, on_result,
+        intervals=parse_job_intervals(args.job_interval),
+        default_interval=args.interval,
+        jitter=args.jitter,
+        concurrency=args.concurrency,
+        throttle=throttle,
+        maintenance=maintenance,
+    )
+    signal.signal(signal.SIGTERM, lambda signum, frame: watcher.stop())
+    log(f"👀 Watching {len(jobs)} job(s), polling every {args.interval:.0f}s")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        maintenance()
+        store.close()
+        log("👋 Stopped watching")
+
+def main():
+    args = parse_args()
+    locations = [location.strip() for location in args.locations.split(",") if location.strip()]
+    rooms = [int(room) for room in args.rooms.split(",") if room.strip()]
+    unknown = [room for room in rooms if room not in ROOM_TYPES]
+    if unknown:
+        raise SystemExit(f"Unknown room type(s): {unknown}. Choose from {list(ROOM_TYPES)}")
+    jobs = [(location, room) for location in locations for room in rooms]
+    if not jobs:
+        raise SystemExit("❌ Nothing to scan, --locations and --rooms need at least one value each")
+    if args.watch and args.no_store:
+        raise SystemExit("❌ Watch mode needs the listings store to detect changes, drop --no-store")
+    profile_job = parse_job(args.profile_job) if args.profile_job else None
+    if profile_job and profile_job not in jobs:
+        raise SystemExit(f"❌ --profile-job {args.profile_job} isn't one of the jobs being scanned")
+    if args.metrics_json or args.metrics_prom:
+        metrics.enable()
+
+    try:
+        writers = [open_writer(path) for path in args.output]
+    except (ValueError, ImportError) as e:
+        raise SystemExit(f"❌ {e}")
+
+    # Stream each job's listings to the output files as soon as it finishes
+    def write_result(job, result, latency):
+        if result and writers:
+            with metrics.timer("write"):
+                for writer in writers:
+                    writer.write(job[0], job[1], result['listings'])
+
+    throttle = HostThrottle(rate=args.rate, burst=args.burst)
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, ttl=args.cache_ttl)
+    manager = StrategyManager(STRATEGIES, args.stats)
+
+    # Units already in the store, for stopping incremental scans early
+    known = {}
+    if args.incremental and not args.no_store:
+        store = ListingsStore(args.store)
+        try:
+            known = {job: set(store.active_units(*job)) for job in jobs}
+        finally:
+            store.close()
+
+    # Later result pages of every job go to one long-lived pool, so its pooled
+    # sessions stay warm and at most page_concurrency pages are in flight
+    page_pool = ThreadPoolExecutor(max_workers=args.page_concurrency) if args.page_concurrency > 0 else None
+
+    def run_job(location, room, throttle, page_pool):
+        with metrics.timer("job"):
+            result = check_listings(room, location, throttle, cache, args.parser, manager,
+                                    known=known.get((location, room)), page_pool=page_pool,
+                                    page_concurrency=args.page_concurrency, max_pages=args.max_pages,
+                                    timeout=(args.connect_timeout, args.read_timeout))
+        metrics.count("jobs", outcome="ok" if result else "failed")
+        return result
+
+    # cProfile records every thread on Python 3.12+, so the profiled job runs
+    # alone on this thread, pages included, before any other job starts. Its
+    # result then stands in for the job's first run
+    profiled = {}
+    profile_time = 0.0
+    if profile_job:
+        start = time.perf_counter()
+        profiled[profile_job] = profile_call(args.profile_out, run_job, *profile_job, throttle, None)
+        profile_time = time.perf_counter() - start
+
+    def check(location, room, throttle):
+        if (location, room) in profiled:
+            return profiled.pop((location, room))
+        return run_job(location, room, throttle, page_pool)
+
+    if args.watch:
+        try:
+            watch(args, jobs, check, known, throttle, cache, manager, write_result)
+        finally:
+            if page_pool:
+                page_pool.shutdown(cancel_futures=True)
+            for writer in writers:
+                writer.close()
+        return
+
+    try:
+        results, stats = run_scan(
+            jobs,
+            check,
+            concurrency=args.concurrency,
+            throttle=throttle,
+            on_result=write_result,
+        )
+    finally:
+        if page_pool:
+            page_pool.shutdown(cancel_futures=True)
+        for writer in writers:
+            writer.close()
+        manager.save()
+    if cache:
+        cache.evict()
+    if profile_job:
+        # The profiled job ran before the scan, count its real latency
+        results = [(job, result, profile_time if job == profile_job else latency) for job, result, latency in results]
+        stats['serial_time'] += profile_time
+    metrics.observe("scan", stats['wall_time'])
+    metrics.mark_run()
+
+    all_results = [result or empty_result(location, room) for (location, room), result, latency in results]
+    failed = [job for job, result, latency in results if result is None]
+
+    # Print final results, or only what changed since the previous scan
+    if args.no_store or args.full:
+        print_results(all_results)
+    if not args.no_store:
+        store = ListingsStore(args.store)
+        try:
+            # Failed jobs (None) are skipped and partial ones only add units,
+            # so units we didn't get to see aren't reported as removed
+            with metrics.timer("store"):
+                diffs = store.record_scan([
+                    (location, room, result['listings'] if result else None, bool(result) and result['complete'])
+                    for (location, room), result, latency in results
+                ])
+        finally:
+            store.close()
+        print_diffs(diffs, failed)
+    print_failures(failed)
+
+    # Print scan timings
+    print(f"\n⏱️ Scanned {stats['jobs']} job(s) in {stats['wall_time']:.1f}s "
+          f"(sum of job latencies {stats['serial_time']:.1f}s, "
+          f"{stats['serial_time'] / max(stats['wall_time'], 1e-9):.1f}x speedup)")
+    for (location, room), result, latency in results:
+        print(f"   {location_name(location)} / {ROOM_TYPES[room]}: {latency:.1f}s")
+
+    # Print how each header strategy has been doing
+    print("\n🛡️ Request strategies:")
+    for line in manager.summary():
+        print(f"   {line}")
+
+    write_metrics(args)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,137 @@
+"""Compare listing parse time and peak memory across parser backends.
+
+Runs the original BeautifulSoup tree walk from check_listings against the
+listing_parser backends on the saved search pages in benchmarks/fixtures.
+
+    python -m benchmarks.bench_parser [--repeat 5]
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from apartments import filter_listings, LOCATION
+from benchmarks.make_fixtures import FIXTURES_DIR
+from listing_parser import BACKENDS, parse_page
+
+FIXTURES = ["search_3.html", "search_40.html", "search_400.html"]
+
+
+def legacy_parse(html, room, location=LOCATION):
+    # The parsing code from check_listings before listing_parser existed
+    soup = BeautifulSoup(html, "html.parser")
+    container = None
+    for selector in ["div.all-units-section.cs_search_card.search-content",
+                     "div.all-units-section", "div.search-content"]:
+        container = soup.select_one(selector)
+        if container:
+            break
+    if not container:
+        return None
+    listings = container.find_all("section", class_="all-units-cards")
+    if not listings:
+        return None
+
+    filtered_listings = []
+    for listing in listings:
+        location_elem = listing.find("div", class_="card-details")
+        location_text = ""
+        room_type_text = ""
+        if location_elem:
+            span = location_elem.find("span")
+            if span:
+                location_text = span.get_text(strip=True)
+        card_details = listing.find_all("div", class_="card-details")
+        for detail in card_details:
+            span = detail.find("span")
+            if span:
+                text = span.get_text(strip=True)
+                if "Type:" in text:
+                    room_type_i = span.find("i")
+                    if room_type_i:
+                        room_type_text = room_type_i.get_text(strip=True).lower()
+                        break
+        location_match = location.replace('-', ' ').lower() in location_text.lower() or location_text.lower() in location.replace('-', ' ').lower()
+        room_match = False
+        if room == 1:
+            room_match = "1 bedroom" in room_type_text or "studio" in room_type_text
+        elif room == 2:
+            room_match = "2 bedroom" in room_type_text or "2 room" in room_type_text
+        elif room == 3:
+            room_match = "3 bedroom" in room_type_text or "3 room" in room_type_text
+        if location_match and room_match:
+            filtered_listings.append(listing)
+
+    result_lines = []
+    for listing in filtered_listings:
+        title_elem = listing.find("h3")
+        title = title_elem.get_text(strip=True) if title_elem else "N/A"
+        card_details = listing.find_all("div", class_="card-details")
+        price = unit_no = card_location = "N/A"
+        for detail in card_details:
+            span = detail.find("span")
+            if span:
+                text = span.get_text(strip=True)
+                if "Price" in text:
+                    price_i = span.find("i")
+                    if price_i:
+                        price_text = price_i.get_text(strip=True)
+                        price = price_text.replace('\n', '').replace('/', '').replace('Year', '').strip()
+                elif "Unit No." in text:
+                    unit_i = span.find("i")
+                    if unit_i:
+                        unit_no = unit_i.get_text(strip=True)
+                elif not any(keyword in text for keyword in ["Price", "Unit No.", "Size", "Type", "Parking"]):
+                    card_location = text
+        result_lines.append(f"- {title} (Unit {unit_no}): {price} AED/Year - {card_location}")
+    return result_lines
+
+
+def new_parse(html, room, backend, location=LOCATION):
+    # Parse and filter one page the way check_listings does
+    cards = parse_page(html, backend)
+    return list(filter_listings(cards or [], room, location))
+
+
+def measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--room", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'fixture':<18}{'parser':<14}{'time (ms)':>11}{'peak (KB)':>11}{'matches':>9}")
+    for name in FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            html = f.read()
+
+        candidates = [("legacy", lambda: legacy_parse(html, args.room))]
+        for backend in BACKENDS:
+            candidates.append((backend, lambda backend=backend: new_parse(html, args.room, backend)))
+
+        for label, func in candidates:
+            try:
+                matches = len(func() or [])
+                best, peak = measure(func, args.repeat)
+            except (FeatureNotFound, ImportError):
+                print(f"{name:<18}{label:<14}{'not installed':>22}")
+                continue
+            print(f"{name:<18}{label:<14}{best * 1000:>11.2f}{peak / 1024:>11.0f}{matches:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""End-to-end scan benchmark against the local fixture server.
+
+Runs check_listings through run_scan for growing numbers of jobs and
+reports throughput, fetch latency percentiles, parse time per card and
+peak memory, without touching wasl.ae.
+
+    python -m benchmarks.bench_scan [--sizes 3,30,300,1000] [--mix captcha=0.02,empty=0.1]
+"""
+import argparse
+import contextlib
+import itertools
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import apartments
+from benchmarks.fixture_server import FixtureServer, parse_mix
+from benchmarks.make_fixtures import FIXTURES_DIR
+from http_cache import get_session
+from listing_parser import parse_search_page, BACKENDS
+from scanner import run_scan, HostThrottle
+from strategies import StrategyManager
+
+LOCATIONS = ["muhaisnah-fourth", "al-qusais", "al-nahda", "deira"]
+
+fetch_latencies = []
+fetch_lock = threading.Lock()
+
+
+def record_fetch(response, *args, **kwargs):
+    with fetch_lock:
+        fetch_latencies.append(response.elapsed.total_seconds())
+
+
+def timed_session():
+    # The pooled session of the calling thread, timing every response it gets
+    session = get_session()
+    if record_fetch not in session.hooks["response"]:
+        session.hooks["response"].append(record_fetch)
+    return session
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def make_jobs(count):
+    pairs = itertools.cycle((location, room) for location in LOCATIONS for room in apartments.ROOM_TYPES)
+    return list(itertools.islice(pairs, count))
+
+
+def bench_scan(size, args):
+    manager = StrategyManager(apartments.STRATEGIES, path=None, breaker_threshold=10 ** 9)
+    throttle = HostThrottle(rate=args.rate, burst=args.concurrency)
+    jobs = make_jobs(size)
+    fetch_latencies.clear()
+
+    page_pool = ThreadPoolExecutor(max_workers=apartments.PAGE_CONCURRENCY)
+
+    def check(location, room, throttle):
+        return apartments.check_listings(room, location, throttle, None, args.parser, manager,
+                                         page_pool=page_pool)
+
+    # tracemalloc slows parsing down noticeably, so it can be switched off
+    if args.memory:
+        tracemalloc.start()
+    with page_pool:
+        results, stats = run_scan(jobs, check, concurrency=args.concurrency, throttle=throttle)
+    peak = 0
+    if args.memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    ok = sum(1 for _, result, _ in results if result is not None)
+    job_latencies = [latency for _, _, latency in results]
+    return {
+        'jobs': size,
+        'ok': ok,
+        'wall': stats['wall_time'],
+        'throughput': size / stats['wall_time'],
+        'fetches': len(fetch_latencies),
+        'p50': percentile(fetch_latencies, 0.5),
+        'p90': percentile(fetch_latencies, 0.9),
+        'p99': percentile(fetch_latencies, 0.99),
+        'job_p50': statistics.median(job_latencies),
+        'peak': peak,
+    }
+
+
+def bench_parse(backend, repeat=5):
+    with open(os.path.join(FIXTURES_DIR, "search_400.html"), encoding="utf-8") as f:
+        html = f.read()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cards, _ = parse_search_page(html, backend)
+        best = min(best, time.perf_counter() - start)
+    return best / len(cards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="3,30,300,1000",
+                        help="comma-separated job counts (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=1000.0,
+                        help="requests per second allowed to the fixture server (default: %(default)s)")
+    parser.add_argument("--parser", choices=BACKENDS, default=apartments.PARSER_BACKEND)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("empty=0.1,paged=0.1"),
+                        help="share of each response kind served (default: empty=0.1,paged=0.1)")
+    parser.add_argument("--delay", type=float, default=0.02,
+                        help="simulated network delay per response in seconds (default: %(default)s)")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip peak memory tracing for faster, more realistic timings")
+    args = parser.parse_args()
+
+    print(f"Parse time per card ({args.parser}): {bench_parse(args.parser) * 1e6:.0f} µs")
+
+    with FixtureServer(mix=args.mix, delay=args.delay) as server:
+        apartments.BASE_URL = server.url
+        apartments.get_session = timed_session
+        rows = []
+        for size in (int(size) for size in args.sizes.split(",")):
+            # The checker prints a line per empty or failed job; keep the table readable
+            with open(os.devnull, "w") as devnull:
+                with contextlib.redirect_stdout(devnull):
+                    rows.append(bench_scan(size, args))
+
+    print(f"\n{'jobs':>6}{'ok':>6}{'wall (s)':>10}{'jobs/s':>9}{'fetches':>9}"
+          f"{'p50 ms':>8}{'p90 ms':>8}{'p99 ms':>8}{'job p50 ms':>12}{'peak MB':>9}")
+    for row in rows:
+        print(f"{row['jobs']:>6}{row['ok']:>6}{row['wall']:>10.2f}{row['throughput']:>9.1f}{row['fetches']:>9}"
+              f"{row['p50'] * 1000:>8.1f}{row['p90'] * 1000:>8.1f}{row['p99'] * 1000:>8.1f}"
+              f"{row['job_p50'] * 1000:>12.1f}{row['peak'] / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Local stand-in for the wasl.ae residential search endpoint.
+
+Replays the saved pages in benchmarks/fixtures. What a request gets is
+decided by its location/room params, or drawn at random from a mix:
+
+    ok       a page of 40 listing cards
+    paged    three pages of results, following ?page=N
+    empty    the no-search-found page
+    captcha  the Radware/hCaptcha page (status 200)
+    error    a 503
+    slow     the ok page after --slow-delay seconds
+
+Point the checker at it with WASL_BASE_URL:
+
+    python -m benchmarks.fixture_server --port 8000 --mix captcha=0.1,empty=0.2
+    WASL_BASE_URL=http://127.0.0.1:8000/en/search/residential python apartments.py
+"""
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.make_fixtures import FIXTURES_DIR
+
+SEARCH_PATH = "/en/search/residential"
+KINDS = ("ok", "paged", "empty", "captcha", "error", "slow")
+
+
+def load(name):
+    with open(f"{FIXTURES_DIR}/{name}", "rb") as f:
+        return f.read()
+
+
+class FixtureServer:
+    def __init__(self, host="127.0.0.1", port=0, scenarios=None, mix=None, default="ok",
+                 delay=0.0, slow_delay=2.0, seed=0):
+        """scenarios maps (location, room) to a kind; other requests draw a
+        kind from mix ({kind: probability}) or fall back to default. delay
+        is added to every response."""
+        self.scenarios = scenarios or {}
+        self.mix = mix or {}
+        self.default = default
+        self.delay = delay
+        self.slow_delay = slow_delay
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.pages = {
+            "ok": load("search_40.html"),
+            "empty": load("search_empty.html"),
+            "captcha": load("captcha.html"),
+            1: load("search_page1_of_3.html"),
+            2: load("search_page2_of_3.html"),
+            3: load("search_page3_of_3.html"),
+        }
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{SEARCH_PATH}"
+
+    def kind(self, location, room):
+        if (location, room) in self.scenarios:
+            return self.scenarios[(location, room)]
+        with self.lock:
+            draw = self.random.random()
+        for kind, probability in self.mix.items():
+            if draw < probability:
+                return kind
+            draw -= probability
+        return self.default
+
+    def handler(self):
+        fixtures = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != SEARCH_PATH:
+                    return self.reply(404, b"not found")
+                params = parse_qs(url.query)
+                location = params.get("location", [""])[0]
+                room = int(params.get("room", ["0"])[0] or 0)
+                page = int(params.get("page", ["1"])[0] or 1)
+                # Later pages only exist for paged results
+                kind = fixtures.scenarios.get((location, room), "paged") if page > 1 else fixtures.kind(location, room)
+
+                if fixtures.delay:
+                    time.sleep(fixtures.delay)
+                if kind == "error":
+                    return self.reply(503, b"Service Unavailable")
+                if kind == "slow":
+                    time.sleep(fixtures.slow_delay)
+                    kind = "ok"
+                if kind == "paged":
+                    body = fixtures.pages.get(page, fixtures.pages["empty"])
+                else:
+                    body = fixtures.pages[kind]
+
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if kind != "captcha" and self.headers.get("If-None-Match") == etag:
+                    return self.reply(304, b"")
+                self.reply(200, body, {"ETag": etag, "Content-Type": "text/html; charset=utf-8"})
+
+            def reply(self, status, body, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def parse_mix(value):
+    # "captcha=0.1,empty=0.2" -> {"captcha": 0.1, "empty": 0.2}
+    mix = {}
+    for part in filter(None, value.split(",")):
+        kind, probability = part.split("=")
+        if kind not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown kind {kind!r}, choose from {KINDS}")
+        mix[kind] = float(probability)
+    return mix
+
+
+def parse_scenario(value):
+    # "muhaisnah-fourth:1=captcha" -> (("muhaisnah-fourth", 1), "captcha")
+    job, kind = value.split("=")
+    location, room = job.rsplit(":", 1)
+    if kind not in KINDS:
+        raise argparse.ArgumentTypeError(f"unknown kind {kind!r}, choose from {KINDS}")
+    return (location, int(room)), kind
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--default", choices=KINDS, default="ok",
+                        help="what requests get unless a scenario or the mix says otherwise")
+    parser.add_argument("--mix", type=parse_mix, default={},
+                        help="random share of each kind, e.g. captcha=0.1,error=0.05")
+    parser.add_argument("--scenario", type=parse_scenario, action="append", default=[],
+                        metavar="LOCATION:ROOM=KIND", help="fixed kind for one job. Can be repeated")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--slow-delay", type=float, default=2.0, help="seconds a 'slow' response takes")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, dict(args.scenario), args.mix, args.default,
+                           args.delay, args.slow_delay)
+    print(f"Serving fixtures at {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Generate the saved search-result pages used by the benchmarks.
+
+The pages mirror the markup the scraper reads from wasl.ae (listings
+container, all-units-cards sections and card-details spans) surrounded by
+the navigation, scripts and footer that make up most of a real page.
+
+    python -m benchmarks.make_fixtures
+"""
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+LOCATIONS = ["Muhaisnah Fourth", "Al Qusais", "Al Nahda", "Deira"]
+TYPES = ["Studio", "1 Bedroom", "2 Bedroom", "3 Bedroom"]
+BUILDINGS = ["Wasl Oasis", "Wasl Pearl", "Al Khail Heights", "Wasl Hub", "Muhaisnah Residence"]
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Residential Search | wasl</title>
+{scripts}
+</head>
+<body>
+<header class="site-header"><nav><ul>{nav}</ul></nav></header>
+<main>
+<div class="search-filters"><form>{filters}</form></div>
+<div class="all-units-section cs_search_card search-content">
+{cards}
+</div>
+{pagination}
+</main>
+<footer class="site-footer">{footer}</footer>
+</body>
+</html>
+"""
+
+CARD = """<section class="all-units-cards">
+  <div class="card-image"><img src="/media/{unit}.jpg" alt="{building}"></div>
+  <div class="card-body">
+    <h3>{building}</h3>
+    <div class="card-details"><span>{location}</span></div>
+    <div class="card-details"><span>Unit No. <i>{unit}</i></span></div>
+    <div class="card-details"><span>Type: <i>{type}</i></span></div>
+    <div class="card-details"><span>Size <i>{size} sq.ft</i></span></div>
+    <div class="card-details"><span>Parking <i>{parking}</i></span></div>
+    <div class="card-details"><span>Price <i>{price:,}
+      / Year</i></span></div>
+    <a class="btn" href="/en/unit/{unit}">View details</a>
+  </div>
+</section>"""
+
+NO_RESULTS = """<section class="no-search-found"><h4>No search found</h4></section>"""
+
+CAPTCHA_PAGE = """<!DOCTYPE html>
+<html><head><title>Radware Captcha Page</title>
+<script src="https://hcaptcha.com/1/api.js" async defer></script></head>
+<body><div class="h-captcha" data-sitekey="0000"></div></body></html>
+"""
+
+
+def boilerplate(rng):
+    scripts = "\n".join(
+        f'<script>window.__data{i} = {{"id": {i}, "payload": "{"x" * rng.randint(200, 800)}"}};</script>'
+        for i in range(40)
+    )
+    nav = "".join(f'<li><a href="/en/page-{i}">Menu item {i}</a></li>' for i in range(60))
+    filters = "".join(f'<select name="f{i}">' + "".join(
+        f'<option value="{j}">Option {j}</option>' for j in range(30)) + "</select>" for i in range(8))
+    footer = "".join(f'<p><a href="/en/footer-{i}">Footer link {i}</a></p>' for i in range(80))
+    return scripts, nav, filters, footer
+
+
+def pagination(pages):
+    if pages <= 1:
+        return ""
+    links = "".join(
+        f'<li class="page-item"><a class="page-link" href="?page={page}">{page}</a></li>'
+        for page in range(1, pages + 1)
+    )
+    return f'<nav aria-label="Page navigation"><ul class="pagination">{links}</ul></nav>'
+
+
+def card(rng, index):
+    return CARD.format(
+        building=rng.choice(BUILDINGS),
+        location=LOCATIONS[0] if rng.random() < 0.6 else rng.choice(LOCATIONS),
+        unit=f"{rng.randint(1, 9)}{index:04d}",
+        type=rng.choice(TYPES),
+        size=rng.randint(400, 2200),
+        parking=rng.randint(0, 2),
+        price=rng.randrange(30000, 160000, 500),
+    )
+
+
+def search_page(cards, seed=0, pages=1, first_index=0):
+    rng = random.Random(seed)
+    scripts, nav, filters, footer = boilerplate(rng)
+    body = "\n".join(card(rng, first_index + index) for index in range(cards)) if cards else NO_RESULTS
+    return PAGE.format(scripts=scripts, nav=nav, filters=filters, cards=body,
+                       pagination=pagination(pages), footer=footer)
+
+
+def main():
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    pages = {
+        "search_empty.html": search_page(0),
+        "search_3.html": search_page(3, seed=3),
+        "search_40.html": search_page(40, seed=40),
+        "search_400.html": search_page(400, seed=400),
+        "search_page1_of_3.html": search_page(24, seed=101, pages=3),
+        "search_page2_of_3.html": search_page(24, seed=102, pages=3, first_index=24),
+        "search_page3_of_3.html": search_page(10, seed=103, pages=3, first_index=48),
+        "captcha.html": CAPTCHA_PAGE,
+    }
+    for name, html in pages.items():
+        with open(os.path.join(FIXTURES_DIR, name), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"Wrote {name} ({len(html) // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
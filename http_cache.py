@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept open per host by each worker's session
+POOL_SIZE = 10
+
+# Bump when the shape of the cached parse result changes
+CACHE_VERSION = 5
+
+DEFAULT_CACHE_DIR = ".cache/responses"
+DEFAULT_TTL = 0                       # seconds an entry is served without revalidating
+DEFAULT_MAX_AGE = 7 * 24 * 3600       # entries older than this are evicted
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # total size kept on disk
+
+_local = threading.local()
+
+
+def get_session():
+    # One pooled session per worker thread; connections stay warm between jobs
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _local.session = session
+    return session
+
+
+class ResponseCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL,
+                 max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, url, params, strategy):
+        raw = json.dumps([CACHE_VERSION, url, sorted(params.items()), strategy], default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("stored_at", 0) > self.max_age:
+            self._remove(self._path(key))
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, key, response, result):
+        entry = {
+            "url": response.url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "stored_at": time.time(),
+            "result": result,
+        }
+        self._write(key, entry)
+
+    def refresh(self, key, entry):
+        # A 304 confirms the entry is still current
+        entry["fetched_at"] = time.time()
+        entry["stored_at"] = time.time()
+        self._write(key, entry)
+
+    def _write(self, key, entry):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            self._remove(tmp)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self):
+        # Drop entries past max_age, then the least recently stored ones
+        # until the cache fits in max_bytes
+        with self.lock:
+            now = time.time()
+            files = []
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.max_age:
+                    self._remove(path)
+                else:
+                    files.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
@@ -0,0 +1,221 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = etree = None
+
+# "html.parser" ships with Python, "lxml" is BeautifulSoup over the lxml
+# builder, "strainer" only builds the tree for the listings container and
+# "lxml-native" skips BeautifulSoup and reads the cards off lxml's own tree
+BACKENDS = ("html.parser", "lxml", "strainer", "lxml-native")
+NATIVE_BACKEND = "lxml-native"
+
+# Building a BeautifulSoup tree is most of the parse time whatever the
+# builder, so use the native lxml backend whenever lxml is installed
+DEFAULT_BACKEND = NATIVE_BACKEND if lxml else "html.parser"
+
+CONTAINER_SELECTORS = [
+    "div.all-units-section.cs_search_card.search-content",
+    "div.all-units-section",
+    "div.search-content",
+]
+# The strainer keeps the listings container and the pagination links
+CONTAINER_CLASSES = {"all-units-section", "search-content", "pagination"}
+
+
+def is_container_class(value):
+    # class can arrive as the raw attribute string or as a list of classes
+    if not value:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return any(cls in CONTAINER_CLASSES for cls in classes)
+
+
+CONTAINER_STRAINER = SoupStrainer(["div", "ul", "nav"], class_=is_container_class)
+
+NUMBER_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+PAGE_RE = re.compile(r"[?&]page=(\d+)")
+
+
+@dataclass(slots=True)
+class Listing:
+    building: str
+    unit_no: str
+    price: Optional[int]     # AED per year
+    type: str
+    size: Optional[int]      # sq.ft
+    parking: str
+    location: str
+
+
+def parse_number(text):
+    # "45,000 / Year" -> 45000, "750 sq.ft" -> 750
+    match = NUMBER_RE.search(text)
+    if not match:
+        return None
+    return int(float(match.group().replace(",", "")))
+
+
+def make_soup(html, backend=DEFAULT_BACKEND):
+    if backend == "strainer":
+        return BeautifulSoup(html, "html.parser", parse_only=CONTAINER_STRAINER)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}, choose from {BACKENDS}")
+    return BeautifulSoup(html, backend)
+
+
+def find_container(soup):
+    for selector in CONTAINER_SELECTORS:
+        container = soup.select_one(selector)
+        if container:
+            return container
+    return None
+
+
+def parse_card(card):
+    title_elem = card.find("h3")
+    building = title_elem.get_text(strip=True) if title_elem else "N/A"
+    unit_no = card_type = parking = location = "N/A"
+    price = size = None
+
+    # Walk every card-details block once, reading the label and its <i> value
+    for detail in card.find_all("div", class_="card-details"):
+        span = detail.find("span")
+        if not span:
+            continue
+        text = span.get_text(strip=True)
+        value_elem = span.find("i")
+        value = value_elem.get_text(strip=True) if value_elem else ""
+        if "Price" in text:
+            price = parse_number(value)
+        elif "Unit No." in text:
+            unit_no = value or unit_no
+        elif "Type" in text:
+            card_type = value or card_type
+        elif "Size" in text:
+            size = parse_number(value)
+        elif "Parking" in text:
+            parking = value or parking
+        elif location == "N/A":
+            # The only unlabelled detail is the location
+            location = text
+
+    return Listing(building, unit_no, price, card_type, size, parking, location)
+
+
+def parse_page_count(soup):
+    # Highest ?page=N linked from the pagination; 1 when there is none
+    pages = 1
+    for link in soup.select(".pagination a[href]"):
+        match = PAGE_RE.search(link["href"])
+        if match:
+            pages = max(pages, int(match.group(1)))
+    return pages
+
+
+def has_class(name):
+    # XPath test matching one class among many, like the CSS .name selector
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if lxml:
+    NATIVE_CONTAINERS = [
+        etree.XPath(f"//div[{has_class('all-units-section')} and {has_class('cs_search_card')}"
+                    f" and {has_class('search-content')}]"),
+        etree.XPath(f"//div[{has_class('all-units-section')}]"),
+        etree.XPath(f"//div[{has_class('search-content')}]"),
+    ]
+    NATIVE_CARDS = etree.XPath(f".//section[{has_class('all-units-cards')}]")
+    NATIVE_DETAILS = etree.XPath(f".//div[{has_class('card-details')}]")
+    NATIVE_PAGE_LINKS = etree.XPath(f"//*[{has_class('pagination')}]//a/@href")
+    NATIVE_TEXT = etree.XPath(".//text()")
+
+
+def native_text(element):
+    # Same as BeautifulSoup's get_text(strip=True): every text node stripped
+    # and joined, comments left out
+    return "".join(text.strip() for text in NATIVE_TEXT(element))
+
+
+def native_first(element, tag):
+    return next(element.iterdescendants(tag), None)
+
+
+def parse_native_card(card):
+    # parse_card() for an lxml element
+    title_elem = native_first(card, "h3")
+    building = native_text(title_elem) if title_elem is not None else "N/A"
+    unit_no = card_type = parking = location = "N/A"
+    price = size = None
+
+    for detail in NATIVE_DETAILS(card):
+        span = native_first(detail, "span")
+        if span is None:
+            continue
+        text = native_text(span)
+        value_elem = native_first(span, "i")
+        value = native_text(value_elem) if value_elem is not None else ""
+        if "Price" in text:
+            price = parse_number(value)
+        elif "Unit No." in text:
+            unit_no = value or unit_no
+        elif "Type" in text:
+            card_type = value or card_type
+        elif "Size" in text:
+            size = parse_number(value)
+        elif "Parking" in text:
+            parking = value or parking
+        elif location == "N/A":
+            location = text
+
+    return Listing(building, unit_no, price, card_type, size, parking, location)
+
+
+def parse_native(html):
+    # parse_search_page() straight from lxml's tree, without BeautifulSoup
+    if lxml is None:
+        raise ImportError("The lxml-native parser needs lxml: pip install lxml")
+    if not html.strip():
+        return None, 1
+    try:
+        root = lxml.html.fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        root = lxml.html.fromstring(html.encode("utf-8"))
+    pages = 1
+    for href in NATIVE_PAGE_LINKS(root):
+        match = PAGE_RE.search(href)
+        if match:
+            pages = max(pages, int(match.group(1)))
+    for find in NATIVE_CONTAINERS:
+        found = find(root)
+        if found:
+            return [parse_native_card(card) for card in NATIVE_CARDS(found[0])], pages
+    return None, pages
+
+
+def parse_search_page(html, backend=DEFAULT_BACKEND):
+    """Parse a search results page into Listing records and its page count.
+
+    Returns (cards, page_count). cards is None when the listings container
+    can't be found, otherwise the (possibly empty) list of cards in page order.
+    """
+    if backend == NATIVE_BACKEND:
+        return parse_native(html)
+    soup = make_soup(html, backend)
+    container = find_container(soup)
+    if container is None:
+        return None, 1
+    cards = [parse_card(card) for card in container.find_all("section", class_="all-units-cards")]
+    return cards, parse_page_count(soup)
+
+
+def parse_page(html, backend=DEFAULT_BACKEND):
+    # Just the cards of a single page, see parse_search_page()
+    return parse_search_page(html, backend)[0]
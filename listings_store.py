@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import time
+from dataclasses import asdict
+
+from listing_parser import Listing
+
+DEFAULT_STORE_PATH = ".cache/listings.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    jobs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    location TEXT NOT NULL,
+    room INTEGER NOT NULL,
+    building TEXT NOT NULL,
+    unit_no TEXT NOT NULL,
+    price INTEGER,
+    type TEXT,
+    size INTEGER,
+    parking TEXT,
+    card_location TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (location, room, building, unit_no)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    location TEXT NOT NULL,
+    room INTEGER NOT NULL,
+    building TEXT NOT NULL,
+    unit_no TEXT NOT NULL,
+    price INTEGER,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_units_unit_no ON units(unit_no);
+CREATE INDEX IF NOT EXISTS idx_units_active ON units(location, room, active);
+CREATE INDEX IF NOT EXISTS idx_observations_unit_no ON observations(unit_no);
+CREATE INDEX IF NOT EXISTS idx_observations_location_room ON observations(location, room);
+"""
+
+UPSERT_UNIT = """
+INSERT INTO units (location, room, building, unit_no, price, type, size, parking,
+                   card_location, first_seen, last_seen, active)
+VALUES (:location, :room, :building, :unit_no, :price, :type, :size, :parking,
+        :card_location, :seen_at, :seen_at, 1)
+ON CONFLICT (location, room, building, unit_no) DO UPDATE SET
+    price = excluded.price,
+    type = excluded.type,
+    size = excluded.size,
+    parking = excluded.parking,
+    card_location = excluded.card_location,
+    last_seen = excluded.last_seen,
+    active = 1
+"""
+
+INSERT_OBSERVATION = """
+INSERT INTO observations (scan_id, location, room, building, unit_no, price, seen_at)
+VALUES (:scan_id, :location, :room, :building, :unit_no, :price, :seen_at)
+"""
+
+
+class ListingsStore:
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def active_units(self, location, room):
+        rows = self.conn.execute(
+            "SELECT * FROM units WHERE location = ? AND room = ? AND active = 1",
+            (location, room),
+        )
+        return {(row["building"], row["unit_no"]): dict(row) for row in rows}
+
+    def record_scan(self, scans):
+        """Upsert one scan's units and return what changed.
+
+        scans is a list of (location, room, listings, complete) where listings
+        is a list of Listing records, or None when the job failed and should
+        be left alone. Units missing from an incomplete job (one that
+        stopped paging early) are not marked removed. Everything is written
+        in a single transaction. Returns one diff dict per job with 'added'
+        and 'removed' Listing lists and a 'changed' list of (Listing,
+        old_price) pairs.
+        """
+        now = time.time()
+        diffs = []
+        with self.conn:
+            scan_id = self.conn.execute(
+                "INSERT INTO scans (started_at, jobs) VALUES (?, ?)", (now, len(scans))
+            ).lastrowid
+            upserts = []
+            removals = []
+            for location, room, listings, complete in scans:
+                if listings is None:
+                    continue
+                previous = self.active_units(location, room)
+                diff = {'location': location, 'room': room, 'added': [], 'removed': [], 'changed': []}
+                seen = set()
+                for listing in listings:
+                    key = (listing.building, listing.unit_no)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    old = previous.get(key)
+                    if old is None:
+                        diff['added'].append(listing)
+                    elif old['price'] != listing.price:
+                        diff['changed'].append((listing, old['price']))
+                    upserts.append({
+                        **asdict(listing),
+                        'card_location': listing.location,
+                        'location': location,
+                        'room': room,
+                        'scan_id': scan_id,
+                        'seen_at': now,
+                    })
+                for key, old in previous.items():
+                    if complete and key not in seen:
+                        diff['removed'].append(Listing(
+                            old['building'], old['unit_no'], old['price'], old['type'],
+                            old['size'], old['parking'], old['card_location'],
+                        ))
+                        removals.append((location, room, old['building'], old['unit_no']))
+                diffs.append(diff)
+
+            self.conn.executemany(UPSERT_UNIT, upserts)
+            self.conn.executemany(INSERT_OBSERVATION, upserts)
+            self.conn.executemany(
+                "UPDATE units SET active = 0 WHERE location = ? AND room = ? AND building = ? AND unit_no = ?",
+                removals,
+            )
+        return diffs
@@ -0,0 +1,167 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import nullcontext
+
+PROMETHEUS_PREFIX = "apartments"
+DEFAULT_PROFILE_PATH = "profile.pstats"
+
+# Returned by timer() while metrics are off, so instrumented code pays for
+# one attribute check and nothing else
+NULL_TIMER = nullcontext()
+
+
+class Timer:
+    __slots__ = ("metrics", "key", "start")
+
+    def __init__(self, metrics, key):
+        self.metrics = metrics
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics._observe(self.key, time.perf_counter() - self.start)
+
+
+class Metrics:
+    """Timings and counters for each stage of a scan.
+
+    Stages are timed with `with metrics.timer("parse"):` and events counted
+    with metrics.count("bytes", len(body)). Labels are keyword arguments.
+    Everything is a no-op until enable() is called.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.last_run = None
+            self.timers = {}
+            self.counters = {}
+
+    def timer(self, stage, **labels):
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, (stage, tuple(sorted(labels.items()))))
+
+    def observe(self, stage, seconds, **labels):
+        if self.enabled:
+            self._observe((stage, tuple(sorted(labels.items()))), seconds)
+
+    def _observe(self, key, seconds):
+        with self.lock:
+            timer = self.timers.get(key)
+            if timer is None:
+                self.timers[key] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    def count(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def mark_run(self):
+        # Called when a scan or watch poll finishes
+        if self.enabled:
+            with self.lock:
+                self.last_run = time.time()
+
+    def report(self):
+        with self.lock:
+            return {
+                "started_at": self.started_at,
+                "duration": time.time() - self.started_at,
+                "last_run": self.last_run,
+                "timers": [
+                    {"stage": stage, "labels": dict(labels), "count": count, "total": total, "max": longest}
+                    for (stage, labels), (count, total, longest) in sorted(self.timers.items())
+                ],
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+            }
+
+    def write_json(self, path):
+        write_file(path, json.dumps(self.report(), indent=2))
+
+    def write_prometheus(self, path):
+        report = self.report()
+        # Each metric's samples have to follow its TYPE line as one group
+        lines = []
+        for name, kind, field, fmt in (
+            ("stage_seconds_total", "counter", "total", ".6f"),
+            ("stage_calls_total", "counter", "count", "d"),
+            ("stage_seconds_max", "gauge", "max", ".6f"),
+        ):
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {kind}")
+            for timer in report["timers"]:
+                labels = format_labels({"stage": timer["stage"], **timer["labels"]})
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{labels} {timer[field]:{fmt}}")
+        name = None
+        for counter in report["counters"]:
+            if counter["name"] != name:
+                name = counter["name"]
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name}_total counter")
+            labels = format_labels(counter["labels"])
+            lines.append(f"{PROMETHEUS_PREFIX}_{name}_total{labels} {counter['value']}")
+        if report["last_run"] is not None:
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_last_run_timestamp_seconds gauge")
+            lines.append(f"{PROMETHEUS_PREFIX}_last_run_timestamp_seconds {report['last_run']:.0f}")
+        write_file(path, "\n".join(lines) + "\n")
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def write_file(path, text):
+    # Write next to the target and rename, so scrapers never read half a file
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def profile_call(path, func, *args, **kwargs):
+    # Run func under cProfile, save the stats to path and print the top entries
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(15)
+        print(out.getvalue())
+
+
+metrics = Metrics()
@@ -0,0 +1,98 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+# Default politeness budget: at most one request every 5 seconds per host,
+# with a small burst so the first few jobs don't wait on each other
+DEFAULT_RATE = 0.2
+DEFAULT_BURST = 3
+DEFAULT_CONCURRENCY = 4
+
+_output_lock = threading.Lock()
+
+
+def emit(line):
+    # print() writes the text and the newline separately, so lines from
+    # worker threads could run together; write each one whole under a lock
+    with _output_lock:
+        sys.stdout.write(f"{line}\n")
+        sys.stdout.flush()
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # Block until a token is available, then spend it
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostThrottle:
+    # One token bucket per host so several sites can be scanned side by side
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        bucket.acquire()
+
+
+def run_scan(jobs, check, concurrency=DEFAULT_CONCURRENCY, throttle=None, on_result=None):
+    """Run check(location, room, throttle) for every (location, room) job.
+
+    on_result(job, result, latency) is called from the calling thread as
+    each job finishes. Returns (results, stats) where results is a list of
+    (job, result, latency) in job order and stats holds the timings.
+    """
+    throttle = throttle or HostThrottle()
+
+    def timed(job):
+        start = time.perf_counter()
+        try:
+            result = check(job[0], job[1], throttle)
+        except Exception as e:
+            emit(f"❌ Error scanning {job[1]} in {job[0]}: {e}")
+            result = None
+        return result, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(timed, job): index for index, job in enumerate(jobs)}
+        results = [None] * len(jobs)
+        for future in as_completed(futures):
+            index = futures[future]
+            result, latency = future.result()
+            results[index] = (jobs[index], result, latency)
+            if on_result:
+                on_result(jobs[index], result, latency)
+    wall = time.perf_counter() - start
+
+    stats = {
+        'jobs': len(jobs),
+        'wall_time': wall,
+        'serial_time': sum(latency for _, _, latency in results),
+    }
+    return results, stats
@@ -0,0 +1,133 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+DEFAULT_STATS_PATH = ".cache/strategy_stats.json"
+
+# Weight of the newest outcome in a strategy's success score, so a strategy
+# that starts getting CAPTCHAs drops down the order within a few requests
+SCORE_ALPHA = 0.2
+
+BACKOFF_BASE = 2        # seconds before the first retry on a blocked host
+BACKOFF_MAX = 120       # cap on a single backoff delay
+BREAKER_THRESHOLD = 5   # consecutive blocks before we stop requesting a host
+BREAKER_COOLDOWN = 900  # seconds the breaker stays open before one trial request
+
+SUCCESS = "success"
+CAPTCHA = "captcha"
+ERROR = "error"
+BLOCKED = (CAPTCHA,)
+
+
+def new_strategy_stats():
+    return {SUCCESS: 0, CAPTCHA: 0, ERROR: 0, "score": 1.0, "latency": None}
+
+
+def new_host_state():
+    return {"failures": 0, "opened_at": None}
+
+
+class StrategyManager:
+    def __init__(self, strategies, path=DEFAULT_STATS_PATH, breaker_threshold=BREAKER_THRESHOLD,
+                 breaker_cooldown=BREAKER_COOLDOWN):
+        self.strategies = strategies
+        self.path = path
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.lock = threading.Lock()
+        self.stats = {name: new_strategy_stats() for name, _ in strategies}
+        self.hosts = {}
+        self.load()
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for name, stats in saved.get("strategies", {}).items():
+            if name in self.stats:
+                self.stats[name].update(stats)
+        for host, state in saved.get("hosts", {}).items():
+            self.hosts[host] = {**new_host_state(), **state}
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            data = {"strategies": self.stats, "hosts": self.hosts}
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+
+    def ordered(self):
+        # Best observed success first; faster strategies win ties, and
+        # untried ones (no latency yet) are tried before known ones
+        with self.lock:
+            def rank(strategy):
+                stats = self.stats[strategy[0]]
+                return (-round(stats["score"], 3), stats["latency"] or 0)
+            return sorted(self.strategies, key=rank)
+
+    def allow(self, host):
+        # Circuit breaker: once open, refuse requests until the cooldown has
+        # passed, then let a single trial through (half-open)
+        with self.lock:
+            state = self.hosts.setdefault(host, new_host_state())
+            if state["opened_at"] is None:
+                return True
+            if time.time() - state["opened_at"] < self.breaker_cooldown:
+                return False
+            state["opened_at"] = time.time()
+            return True
+
+    def backoff_delay(self, host):
+        # Exponential backoff with full jitter, based on consecutive failures
+        with self.lock:
+            failures = self.hosts.get(host, new_host_state())["failures"]
+        if failures == 0:
+            return 0
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures - 1)))
+
+    def record(self, name, host, outcome, latency):
+        with self.lock:
+            stats = self.stats[name]
+            stats[outcome] += 1
+            stats["score"] = (1 - SCORE_ALPHA) * stats["score"] + SCORE_ALPHA * (outcome == SUCCESS)
+            if stats["latency"] is None:
+                stats["latency"] = latency
+            else:
+                stats["latency"] = (1 - SCORE_ALPHA) * stats["latency"] + SCORE_ALPHA * latency
+
+            state = self.hosts.setdefault(host, new_host_state())
+            if outcome == SUCCESS:
+                state["failures"] = 0
+                state["opened_at"] = None
+            else:
+                state["failures"] += 1
+                if outcome in BLOCKED and state["failures"] >= self.breaker_threshold:
+                    state["opened_at"] = time.time()
+
+    def summary(self):
+        lines = []
+        with self.lock:
+            for name, _ in self.strategies:
+                stats = self.stats[name]
+                attempts = stats[SUCCESS] + stats[CAPTCHA] + stats[ERROR]
+                latency = f"{stats['latency']:.1f}s avg" if stats["latency"] is not None else "no requests yet"
+                lines.append(
+                    f"{name}: {stats[SUCCESS]} ok / {stats[CAPTCHA]} captcha / {stats[ERROR]} error "
+                    f"of {attempts} (score {stats['score']:.2f}, {latency})"
+                )
+            for host, state in self.hosts.items():
+                if state["opened_at"] is not None:
+                    lines.append(f"{host}: circuit open after {state['failures']} consecutive failures")
+        return lines
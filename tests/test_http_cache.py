@@ -0,0 +1,118 @@
+import os
+import time
+
+import pytest
+
+import apartments
+from benchmarks.fixture_server import FixtureServer
+from http_cache import ResponseCache
+from metrics import metrics
+from scanner import HostThrottle
+
+LOCATION = "muhaisnah-fourth"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with FixtureServer(scenarios={(LOCATION, 1): "ok", (LOCATION, 2): "captcha"}) as server:
+        monkeypatch.setattr(apartments, "BASE_URL", server.url)
+        yield server
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    metrics.enable()
+    yield metrics
+    metrics.enabled = False
+    metrics.reset()
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    parse = apartments.parse_search_page
+
+    def counting_parse(html, backend):
+        calls.append(backend)
+        return parse(html, backend)
+    monkeypatch.setattr(apartments, "parse_search_page", counting_parse)
+    return calls
+
+
+def fetch(cache, room=1):
+    throttle = HostThrottle(rate=1000, burst=100)
+    return apartments.fetch_page(room, LOCATION, 1, throttle, cache, "html.parser")
+
+
+def counter(name, **labels):
+    for entry in metrics.report()["counters"]:
+        if entry["name"] == name and entry["labels"] == labels:
+            return entry["value"]
+    return 0
+
+
+def test_unchanged_page_is_revalidated_and_not_parsed(server, counted, parses, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    first = fetch(cache)
+    assert len(first[0]) == 40 and len(parses) == 1
+
+    second = fetch(cache)
+    assert second == first
+    assert len(parses) == 1
+    assert counter("cache", result="not_modified") == 1
+    assert counter("requests", strategy="default", outcome="success") == 2
+
+
+def test_fresh_entry_skips_the_request(server, counted, parses, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    first = fetch(cache)
+    assert fetch(cache) == first
+    assert counter("cache", result="fresh") == 1
+    assert counter("requests", strategy="default", outcome="success") == 1
+
+
+def test_entry_keeps_validators_but_not_the_body(server, tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    fetch(cache)
+    [name] = os.listdir(tmp_path)
+    entry = cache.get(name[:-len(".json")])
+    assert entry["etag"]
+    assert "body" not in entry
+    assert cache.conditional_headers(entry) == {"If-None-Match": entry["etag"]}
+
+
+def test_captcha_pages_are_not_cached(server, tmp_path, monkeypatch):
+    # Skip the pause between strategies
+    monkeypatch.setattr(apartments.random, "uniform", lambda low, high: 0)
+    cache = ResponseCache(str(tmp_path))
+    assert fetch(cache, room=2) is None
+    assert os.listdir(tmp_path) == []
+
+
+def write_entry(cache, key, size, age):
+    path = os.path.join(cache.directory, key + ".json")
+    with open(path, "w") as f:
+        f.write("x" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_evict_drops_old_entries_then_least_recent(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_age=100, max_bytes=250)
+    write_entry(cache, "expired", 10, age=200)
+    write_entry(cache, "oldest", 100, age=50)
+    write_entry(cache, "middle", 100, age=40)
+    write_entry(cache, "newest", 100, age=30)
+
+    cache.evict()
+    assert sorted(os.listdir(tmp_path)) == ["middle.json", "newest.json"]
+
+
+def test_get_ignores_expired_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_age=100)
+    path = os.path.join(str(tmp_path), "stale.json")
+    with open(path, "w") as f:
+        f.write('{"stored_at": %f, "result": null}' % (time.time() - 200))
+    assert cache.get("stale") is None
+    assert not os.path.exists(path)
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+import listing_parser
+from benchmarks.make_fixtures import FIXTURES_DIR
+from listing_parser import (
+    Listing, BACKENDS, parse_number, parse_card, parse_page_count, parse_search_page, parse_native,
+)
+
+# BeautifulSoup and native backends that can run here
+AVAILABLE = [backend for backend in BACKENDS if listing_parser.lxml or "lxml" not in backend]
+
+SPARSE_CARD = """
+<div class="all-units-section search-content">
+<section class="all-units-cards">
+  <div class="card-details"><span>Al Qusais</span></div>
+  <div class="card-details"><span>Type: <i>1 Bedroom</i></span></div>
+  <div class="card-details"><span>Price <i></i></span></div>
+  <div class="card-details"></div>
+</section>
+</div>
+"""
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("text, number", [
+    ("45,000 / Year", 45000),
+    ("45,000\n      / Year", 45000),
+    ("1,250 sq.ft", 1250),
+    ("750.5 sq.ft", 750),
+    ("", None),
+    ("Call for price", None),
+])
+def test_parse_number(text, number):
+    assert parse_number(text) == number
+
+
+def test_card_missing_labels_keeps_defaults():
+    card = BeautifulSoup(SPARSE_CARD, "html.parser").find("section")
+    assert parse_card(card) == Listing("N/A", "N/A", None, "1 Bedroom", None, "N/A", "Al Qusais")
+
+
+@pytest.mark.parametrize("backend", AVAILABLE)
+def test_every_backend_handles_a_sparse_card(backend):
+    cards, pages = parse_search_page(SPARSE_CARD, backend)
+    assert cards == [Listing("N/A", "N/A", None, "1 Bedroom", None, "N/A", "Al Qusais")]
+    assert pages == 1
+
+
+def test_page_count():
+    assert parse_page_count(BeautifulSoup(fixture("search_page1_of_3.html"), "html.parser")) == 3
+    assert parse_page_count(BeautifulSoup(fixture("search_40.html"), "html.parser")) == 1
+    assert parse_page_count(BeautifulSoup("<ul class='pagination'><a href='/x'>next</a></ul>", "html.parser")) == 1
+
+
+def test_first_card_of_a_fixture():
+    cards, pages = parse_search_page(fixture("search_page1_of_3.html"), "html.parser")
+    assert cards[0] == Listing("Wasl Hub", "70000", 85000, "Studio", 2185, "1", "Muhaisnah Fourth")
+    assert (len(cards), pages) == (24, 3)
+
+
+@pytest.mark.parametrize("name", [
+    "search_40.html", "search_page1_of_3.html", "search_page2_of_3.html", "search_page3_of_3.html",
+    "search_empty.html", "captcha.html",
+])
+def test_backends_agree(name):
+    html = fixture(name)
+    expected = parse_search_page(html, "html.parser")
+    for backend in AVAILABLE:
+        assert parse_search_page(html, backend) == expected, backend
+
+
+def test_missing_container_and_empty_results():
+    assert parse_search_page(fixture("captcha.html"), "html.parser") == (None, 1)
+    assert parse_search_page(fixture("search_empty.html"), "html.parser") == ([], 1)
+
+
+@pytest.mark.skipif(listing_parser.lxml is None, reason="needs lxml")
+def test_native_handles_empty_and_declared_encoding():
+    assert parse_native("") == (None, 1)
+    declared = '<?xml version="1.0" encoding="utf-8"?>' + SPARSE_CARD
+    cards, _ = parse_native(declared)
+    assert cards[0].location == "Al Qusais"
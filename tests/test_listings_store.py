@@ -0,0 +1,90 @@
+import pytest
+
+from listing_parser import Listing
+from listings_store import ListingsStore
+
+LOCATION = "muhaisnah-fourth"
+
+
+def listing(unit_no, price=50000):
+    return Listing("Wasl Oasis", unit_no, price, "1 Bedroom", 750, "1", "Muhaisnah Fourth")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ListingsStore(str(tmp_path / "listings.db"))
+    yield store
+    store.close()
+
+
+def scan(store, listings, complete=True, location=LOCATION, room=1):
+    [diff] = store.record_scan([(location, room, listings, complete)])
+    return diff
+
+
+def test_first_scan_adds_every_unit(store):
+    diff = scan(store, [listing("101"), listing("102")])
+    assert [unit.unit_no for unit in diff["added"]] == ["101", "102"]
+    assert diff["removed"] == [] and diff["changed"] == []
+    assert set(store.active_units(LOCATION, 1)) == {("Wasl Oasis", "101"), ("Wasl Oasis", "102")}
+
+
+def test_unchanged_scan_reports_nothing(store):
+    scan(store, [listing("101")])
+    diff = scan(store, [listing("101")])
+    assert diff["added"] == [] and diff["removed"] == [] and diff["changed"] == []
+
+
+def test_price_change(store):
+    scan(store, [listing("101", 50000)])
+    diff = scan(store, [listing("101", 48000)])
+    [(changed, old_price)] = diff["changed"]
+    assert changed.price == 48000 and old_price == 50000
+    assert store.active_units(LOCATION, 1)[("Wasl Oasis", "101")]["price"] == 48000
+
+
+def test_missing_unit_is_removed_once(store):
+    scan(store, [listing("101"), listing("102")])
+    diff = scan(store, [listing("101")])
+    assert [unit.unit_no for unit in diff["removed"]] == ["102"]
+    assert set(store.active_units(LOCATION, 1)) == {("Wasl Oasis", "101")}
+    assert scan(store, [listing("101")])["removed"] == []
+
+
+def test_removed_unit_coming_back_is_added(store):
+    scan(store, [listing("101")])
+    scan(store, [])
+    diff = scan(store, [listing("101")])
+    assert [unit.unit_no for unit in diff["added"]] == ["101"]
+
+
+def test_incomplete_scan_never_removes(store):
+    scan(store, [listing("101"), listing("102")])
+    diff = scan(store, [listing("101"), listing("103")], complete=False)
+    assert [unit.unit_no for unit in diff["added"]] == ["103"]
+    assert diff["removed"] == []
+    assert len(store.active_units(LOCATION, 1)) == 3
+
+
+def test_failed_job_is_left_alone(store):
+    scan(store, [listing("101")])
+    assert store.record_scan([(LOCATION, 1, None, False)]) == []
+    assert set(store.active_units(LOCATION, 1)) == {("Wasl Oasis", "101")}
+
+
+def test_jobs_are_diffed_separately(store):
+    diffs = store.record_scan([
+        (LOCATION, 1, [listing("101")], True),
+        (LOCATION, 2, [listing("101")], True),
+    ])
+    assert [len(diff["added"]) for diff in diffs] == [1, 1]
+    diffs = store.record_scan([
+        (LOCATION, 1, [], True),
+        (LOCATION, 2, [listing("101")], True),
+    ])
+    assert [len(diff["removed"]) for diff in diffs] == [1, 0]
+
+
+def test_duplicate_cards_count_once(store):
+    diff = scan(store, [listing("101"), listing("101", 40000)])
+    assert len(diff["added"]) == 1
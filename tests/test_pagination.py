@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from apartments import iter_cards, PageFetchError
+from listing_parser import Listing
+
+
+def card(page, index):
+    return Listing("Wasl Oasis", f"{page}{index:02d}", 50000, "1 Bedroom", 750, "1", "Muhaisnah Fourth")
+
+
+def pages(count, per_page=2):
+    return {page: [card(page, index) for index in range(per_page)] for page in range(1, count + 1)}
+
+
+def read(all_pages, page_count, stop_pages=(), page_concurrency=2, failing=()):
+    fetched = []
+
+    def fetch(page):
+        fetched.append(page)
+        return None if page in failing else (all_pages[page], page_count)
+
+    def stop_after(cards):
+        return cards[0].unit_no[0] in {str(page) for page in stop_pages}
+
+    stopped = []
+    with ThreadPoolExecutor(max_workers=page_concurrency) as page_pool:
+        cards = list(iter_cards(all_pages[1], page_count, fetch, page_pool, page_concurrency,
+                                stop_after if stop_pages else None, stopped))
+    return cards, sorted(fetched), stopped
+
+
+def test_reads_every_page_in_order():
+    cards, fetched, stopped = read(pages(5), 5)
+    assert [c.unit_no for c in cards] == [f"{page}{i:02d}" for page in range(1, 6) for i in range(2)]
+    assert fetched == [2, 3, 4, 5]
+    assert stopped == []
+
+
+def test_stop_on_single_page_result_is_not_a_skip():
+    cards, fetched, stopped = read(pages(1), 1, stop_pages=[1])
+    assert len(cards) == 2 and fetched == []
+    assert stopped == []
+
+
+def test_stop_on_first_page_skips_the_rest():
+    cards, fetched, stopped = read(pages(3), 3, stop_pages=[1])
+    assert len(cards) == 2 and fetched == []
+    assert stopped == [1]
+
+
+def test_stop_in_the_last_wave_is_not_a_skip():
+    # Waves are pages 2-3 and 4-5
+    cards, fetched, stopped = read(pages(5), 5, stop_pages=[4])
+    assert len(cards) == 10
+    assert stopped == []
+
+
+def test_stop_before_the_last_wave_skips_later_waves():
+    cards, fetched, stopped = read(pages(5), 5, stop_pages=[2])
+    assert fetched == [2, 3]
+    assert len(cards) == 6
+    assert stopped == [2]
+
+
+def test_unreadable_page_raises():
+    with pytest.raises(PageFetchError):
+        read(pages(3), 3, failing=[3])
+
+
+def test_without_a_pool_pages_are_fetched_in_turn():
+    all_pages = pages(4)
+    fetched = []
+
+    def fetch(page):
+        fetched.append(page)
+        return all_pages[page], 4
+
+    def stop_after(cards):
+        return cards[0].unit_no.startswith("2")
+
+    stopped = []
+    cards = list(iter_cards(all_pages[1], 4, fetch, None, 3, stop_after, stopped))
+    assert fetched == [2] and len(cards) == 4
+    assert stopped == [2]
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+import scanner
+from scanner import TokenBucket, HostThrottle, run_scan
+
+
+class FakeTime:
+    # Stands in for the time module inside scanner; sleeping advances the clock
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(scanner, "time", clock)
+    return clock
+
+
+def test_burst_is_free_then_rate_applies(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.now == 0
+
+    bucket.acquire()
+    assert clock.now == pytest.approx(0.5)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.now == pytest.approx(2.5)
+
+
+def test_idle_time_refills_up_to_burst(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 100
+    for _ in range(2):
+        bucket.acquire()
+    assert clock.now == 100
+    bucket.acquire()
+    assert clock.now == pytest.approx(101)
+
+
+def test_hosts_have_separate_buckets(clock):
+    throttle = HostThrottle(rate=1, burst=1)
+    throttle.acquire("https://a.example/search")
+    throttle.acquire("https://b.example/search?page=2")
+    assert clock.now == 0
+    throttle.acquire("https://a.example/other")
+    assert clock.now == pytest.approx(1)
+
+
+def test_results_come_back_in_job_order():
+    jobs = [("deira", 1), ("al-nahda", 2), ("al-qusais", 3)]
+    # Finish in reverse order of submission
+    delays = {"deira": 0.06, "al-nahda": 0.03, "al-qusais": 0.0}
+    finished = []
+    lock = threading.Lock()
+
+    def check(location, room, throttle):
+        time.sleep(delays[location])
+        return {"location": location, "room": room}
+
+    def on_result(job, result, latency):
+        with lock:
+            finished.append(job)
+
+    results, stats = run_scan(jobs, check, concurrency=3, on_result=on_result)
+    assert [job for job, _, _ in results] == jobs
+    assert [result["location"] for _, result, _ in results] == ["deira", "al-nahda", "al-qusais"]
+    assert finished[0] == ("al-qusais", 3) and sorted(finished) == sorted(jobs)
+    assert stats["jobs"] == 3
+    assert stats["serial_time"] >= stats["wall_time"] > 0
+
+
+def test_failing_job_becomes_none(capsys):
+    def check(location, room, throttle):
+        if room == 2:
+            raise RuntimeError("boom")
+        return room
+
+    results, _ = run_scan([("deira", 1), ("deira", 2), ("deira", 3)], check, concurrency=2)
+    assert [result for _, result, _ in results] == [1, None, 3]
+    assert "❌ Error scanning 2 in deira: boom" in capsys.readouterr().out
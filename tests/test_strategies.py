@@ -0,0 +1,107 @@
+import pytest
+
+import strategies
+from strategies import StrategyManager, SUCCESS, CAPTCHA, ERROR, BACKOFF_BASE
+
+HOST = "www.wasl.ae"
+STRATEGIES = [("default", {}), ("windows-ua", {}), ("no-sec-fetch", {})]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(strategies.time, "time", clock)
+    return clock
+
+
+def manager(**kwargs):
+    return StrategyManager(STRATEGIES, path=None, **kwargs)
+
+
+def names(manager):
+    return [name for name, _ in manager.ordered()]
+
+
+def test_blocked_strategy_drops_down_the_order():
+    m = manager()
+    assert names(m) == ["default", "windows-ua", "no-sec-fetch"]
+    m.record("default", HOST, CAPTCHA, 1.0)
+    assert names(m)[-1] == "default"
+    m.record("windows-ua", HOST, CAPTCHA, 1.0)
+    m.record("windows-ua", HOST, CAPTCHA, 1.0)
+    m.record("default", HOST, SUCCESS, 1.0)
+    assert names(m) == ["no-sec-fetch", "default", "windows-ua"]
+
+
+def test_backoff_grows_with_failures_and_resets(monkeypatch):
+    monkeypatch.setattr(strategies.random, "uniform", lambda low, high: high)
+    m = manager()
+    assert m.backoff_delay(HOST) == 0
+    m.record("default", HOST, ERROR, 1.0)
+    assert m.backoff_delay(HOST) == BACKOFF_BASE
+    m.record("default", HOST, ERROR, 1.0)
+    assert m.backoff_delay(HOST) == BACKOFF_BASE * 2
+    m.record("default", HOST, SUCCESS, 1.0)
+    assert m.backoff_delay(HOST) == 0
+
+
+def test_breaker_opens_after_consecutive_blocks(clock):
+    m = manager(breaker_threshold=3, breaker_cooldown=60)
+    for _ in range(2):
+        m.record("default", HOST, CAPTCHA, 1.0)
+    assert m.allow(HOST)
+    m.record("default", HOST, CAPTCHA, 1.0)
+    assert not m.allow(HOST)
+    clock.now += 59
+    assert not m.allow(HOST)
+
+
+def test_errors_alone_never_open_the_breaker(clock):
+    m = manager(breaker_threshold=3, breaker_cooldown=60)
+    for _ in range(10):
+        m.record("default", HOST, ERROR, 1.0)
+    assert m.allow(HOST)
+
+
+def test_half_open_lets_one_trial_through(clock):
+    m = manager(breaker_threshold=1, breaker_cooldown=60)
+    m.record("default", HOST, CAPTCHA, 1.0)
+    clock.now += 61
+    assert m.allow(HOST)
+    # The trial restarts the cooldown until its outcome is recorded
+    assert not m.allow(HOST)
+
+
+def test_failed_trial_reopens_and_success_closes(clock):
+    m = manager(breaker_threshold=1, breaker_cooldown=60)
+    m.record("default", HOST, CAPTCHA, 1.0)
+    clock.now += 61
+    assert m.allow(HOST)
+    m.record("default", HOST, CAPTCHA, 1.0)
+    clock.now += 30
+    assert not m.allow(HOST)
+
+    clock.now += 31
+    assert m.allow(HOST)
+    m.record("default", HOST, SUCCESS, 1.0)
+    assert m.allow(HOST) and m.allow(HOST)
+
+
+def test_stats_survive_a_restart(tmp_path, clock):
+    path = str(tmp_path / "stats.json")
+    m = StrategyManager(STRATEGIES, path=path, breaker_threshold=1)
+    m.record("default", HOST, CAPTCHA, 2.0)
+    m.save()
+
+    restored = StrategyManager(STRATEGIES, path=path, breaker_threshold=1)
+    assert restored.stats["default"][CAPTCHA] == 1
+    assert names(restored)[-1] == "default"
+    assert not restored.allow(HOST)
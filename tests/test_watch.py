@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+import watch
+from watch import Watcher
+
+
+@pytest.fixture(autouse=True)
+def quick_scheduler(monkeypatch):
+    monkeypatch.setattr(watch, "MAX_WAIT", 0.05)
+
+
+def run_for(watcher, seconds):
+    timer = threading.Timer(seconds, watcher.stop)
+    timer.start()
+    watcher.run()
+    timer.cancel()
+
+
+class Recorder:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.polls = []
+        self.results = []
+        self.running = 0
+        self.most_running = 0
+
+    def check(self, location, room, throttle):
+        with self.lock:
+            self.polls.append((location, room))
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return {"location": location, "room": room}
+
+    def on_result(self, job, result):
+        self.results.append((job, result))
+
+
+def test_each_job_polls_on_its_own_interval():
+    recorder = Recorder()
+    fast, slow = ("deira", 1), ("al-qusais", 2)
+    watcher = Watcher([fast, slow], recorder.check, recorder.on_result,
+                      intervals={fast: 0.05}, default_interval=0.4, jitter=0)
+    run_for(watcher, 0.6)
+    assert recorder.polls.count(slow) == 2
+    assert recorder.polls.count(fast) >= 6
+    assert [result for _, result in recorder.results][0] is not None
+
+
+def test_jitter_stays_within_bounds():
+    watcher = Watcher([("deira", 1)], None, None, default_interval=100, jitter=0.1)
+    delays = [watcher.next_delay(("deira", 1)) for _ in range(1000)]
+    assert all(90 <= delay <= 110 for delay in delays)
+    assert max(delays) - min(delays) > 10
+
+
+def test_concurrency_cap():
+    recorder = Recorder(delay=0.05)
+    jobs = [("deira", room) for room in range(6)]
+    watcher = Watcher(jobs, recorder.check, recorder.on_result, default_interval=0.01, jitter=0, concurrency=2)
+    run_for(watcher, 0.4)
+    assert recorder.most_running == 2
+    assert {job for job, _ in recorder.results} == set(jobs)
+
+
+def test_polls_in_flight_are_delivered_after_stop():
+    recorder = Recorder(delay=0.3)
+    watcher = Watcher([("deira", 1)], recorder.check, recorder.on_result, default_interval=60, jitter=0)
+    run_for(watcher, 0.1)
+    assert recorder.results == [(("deira", 1), {"location": "deira", "room": 1})]
+
+
+def test_result_handler_errors_dont_stop_the_watcher(capsys):
+    polls = []
+
+    def on_result(job, result):
+        polls.append(job)
+        raise RuntimeError("store is locked")
+
+    watcher = Watcher([("deira", 1)], lambda location, room, throttle: {}, on_result,
+                      default_interval=0.02, jitter=0)
+    run_for(watcher, 0.2)
+    assert len(polls) >= 3
+    assert "store is locked" in capsys.readouterr().out
+
+
+def test_maintenance_runs_on_schedule(monkeypatch):
+    monkeypatch.setattr(watch, "MAINTENANCE_INTERVAL", 0.05)
+    runs = []
+    recorder = Recorder()
+    watcher = Watcher([("deira", 1)], recorder.check, recorder.on_result, default_interval=60, jitter=0,
+                      maintenance=lambda: runs.append(time.monotonic()))
+    run_for(watcher, 0.3)
+    assert len(runs) >= 3
+
+
+def test_no_jobs_is_an_error():
+    with pytest.raises(ValueError):
+        Watcher([], None, None)
@@ -0,0 +1,76 @@
+import csv
+import json
+import sys
+
+import pytest
+
+from listing_parser import Listing
+from writers import COLUMNS, open_writer, JsonLinesWriter, CsvWriter
+
+LISTINGS = [
+    Listing("Wasl Hub", "70000", 85000, "Studio", 2185, "1", "Muhaisnah Fourth"),
+    Listing("Wasl Oasis", "60003", None, "1 Bedroom", None, "N/A", "Muhaisnah Fourth"),
+]
+
+
+def write(path):
+    writer = open_writer(str(path))
+    writer.write("muhaisnah-fourth", 1, LISTINGS[:1])
+    writer.write("muhaisnah-fourth", 1, [])
+    writer.write("muhaisnah-fourth", 2, LISTINGS[1:])
+    writer.close()
+    return writer
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = tmp_path / "out.jsonl"
+    assert isinstance(write(path), JsonLinesWriter)
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [list(record) for record in records] == [COLUMNS, COLUMNS]
+    assert records[0] == {
+        "search_location": "muhaisnah-fourth", "room": 1, "building": "Wasl Hub", "unit_no": "70000",
+        "price": 85000, "type": "Studio", "size": 2185, "parking": "1", "location": "Muhaisnah Fourth",
+    }
+    assert records[1]["room"] == 2
+    assert records[1]["price"] is None and records[1]["size"] is None
+
+
+def test_csv_round_trip(tmp_path):
+    path = tmp_path / "out.csv"
+    assert isinstance(write(path), CsvWriter)
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == COLUMNS
+    assert rows[1] == ["muhaisnah-fourth", "1", "Wasl Hub", "70000", "85000", "Studio", "2185", "1", "Muhaisnah Fourth"]
+    # Missing numbers are written as empty cells
+    assert rows[2][COLUMNS.index("price")] == "" and rows[2][COLUMNS.index("size")] == ""
+    assert len(rows) == 3
+
+
+def test_parquet_round_trip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+    write(path)
+    table = pq.read_table(str(path))
+    assert table.column_names == COLUMNS
+    assert table.to_pylist() == [
+        {"search_location": "muhaisnah-fourth", "room": 1, "building": "Wasl Hub", "unit_no": "70000",
+         "price": 85000, "type": "Studio", "size": 2185, "parking": "1", "location": "Muhaisnah Fourth"},
+        {"search_location": "muhaisnah-fourth", "room": 2, "building": "Wasl Oasis", "unit_no": "60003",
+         "price": None, "type": "1 Bedroom", "size": None, "parking": "N/A", "location": "Muhaisnah Fourth"},
+    ]
+
+
+def test_parquet_without_pyarrow_says_what_to_install(tmp_path, monkeypatch):
+    # A None entry in sys.modules makes the import fail
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        open_writer(str(tmp_path / "out.parquet"))
+
+
+def test_unknown_extension(tmp_path):
+    with pytest.raises(ValueError, match="output format"):
+        open_writer(str(tmp_path / "out.xlsx"))
+    writer = open_writer(str(tmp_path / "out.json"))
+    writer.close()
+    assert isinstance(writer, JsonLinesWriter)
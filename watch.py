@@ -0,0 +1,135 @@
+import heapq
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+from http_cache import get_session
+from scanner import HostThrottle, emit, DEFAULT_CONCURRENCY
+
+DEFAULT_INTERVAL = 3600      # seconds between polls of the same job
+DEFAULT_JITTER = 0.1         # +/- fraction of the interval added to each poll
+MAINTENANCE_INTERVAL = 600   # seconds between cache eviction / stats saves
+MAX_WAIT = 5                 # longest the scheduler sleeps without checking for stop()
+FAILURE_ALERT_AFTER = 3      # failed polls in a row before the hooks are told about a job
+
+TELEGRAM_URL = "https://api.telegram.org/bot{token}/sendMessage"
+
+
+def log(message):
+    emit(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}")
+
+
+class Watcher:
+    """Poll (location, room) jobs forever, each on its own interval.
+
+    check(location, room, throttle) runs on a pool of worker threads that
+    lives as long as the watcher, so their pooled sessions stay warm.
+    on_result(job, result) and maintenance() run on the watcher's own thread.
+    Nothing is kept per poll beyond the schedule, so memory stays flat.
+    """
+
+    def __init__(self, jobs, check, on_result, intervals=None, default_interval=DEFAULT_INTERVAL,
+                 jitter=DEFAULT_JITTER, concurrency=DEFAULT_CONCURRENCY, throttle=None, maintenance=None):
+        if not jobs:
+            # run() would otherwise wait forever with nothing to poll
+            raise ValueError("Watcher needs at least one job")
+        self.jobs = jobs
+        self.check = check
+        self.on_result = on_result
+        self.intervals = intervals or {}
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.throttle = throttle or HostThrottle()
+        self.maintenance = maintenance
+        self.stop_event = threading.Event()
+
+    def interval(self, job):
+        return self.intervals.get(job, self.default_interval)
+
+    def next_delay(self, job):
+        interval = self.interval(job)
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        # Spread the first polls over the jitter window instead of firing them all at once
+        schedule = [
+            (time.monotonic() + random.uniform(0, self.interval(job) * self.jitter), index, job)
+            for index, job in enumerate(self.jobs)
+        ]
+        heapq.heapify(schedule)
+        running = {}
+        next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+                while schedule and schedule[0][0] <= now and len(running) < self.concurrency:
+                    _, index, job = heapq.heappop(schedule)
+                    running[pool.submit(self.check, job[0], job[1], self.throttle)] = (index, job)
+
+                # Sleep until the next poll is due, a poll finishes, or at most
+                # a few seconds so stop() is noticed promptly
+                if schedule and len(running) < self.concurrency:
+                    timeout = min(MAX_WAIT, max(0, schedule[0][0] - now))
+                else:
+                    timeout = MAX_WAIT
+                if running:
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    done = set()
+                    self.stop_event.wait(timeout)
+
+                for future in done:
+                    index, job = running.pop(future)
+                    try:
+                        self.on_result(job, future.result())
+                    except Exception as e:
+                        log(f"❌ Error handling {job[1]} in {job[0]}: {e}")
+                    heapq.heappush(schedule, (time.monotonic() + self.next_delay(job), index, job))
+
+                if self.maintenance and time.monotonic() >= next_maintenance:
+                    self.maintenance()
+                    next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+            # Let polls already in flight finish so their results aren't lost
+            for future in list(running):
+                index, job = running.pop(future)
+                try:
+                    self.on_result(job, future.result())
+                except Exception as e:
+                    log(f"❌ Error handling {job[1]} in {job[0]}: {e}")
+
+
+class CommandHook:
+    # Run a shell command with the change report on stdin
+    def __init__(self, command):
+        self.command = command
+
+    def __call__(self, text):
+        try:
+            subprocess.run(self.command, shell=True, input=text, text=True, timeout=60, check=True)
+        except (subprocess.SubprocessError, OSError) as e:
+            log(f"❌ Hook {self.command!r} failed: {e}")
+
+
+class TelegramHook:
+    def __init__(self, token, chat_id):
+        self.url = TELEGRAM_URL.format(token=token)
+        self.chat_id = chat_id
+
+    def __call__(self, text):
+        try:
+            response = get_session().post(self.url, data={"chat_id": self.chat_id, "text": text}, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            # The exception text includes the URL, which holds the bot token
+            status = getattr(e.response, "status_code", None)
+            log(f"❌ Telegram notification failed ({status or type(e).__name__})")
@@ -0,0 +1,104 @@
+import csv
+import json
+import os
+from dataclasses import astuple, fields
+
+from listing_parser import Listing
+
+# Every row carries the job it came from ahead of the listing fields
+COLUMNS = ["search_location", "room"] + [field.name for field in fields(Listing)]
+FORMATS = ("jsonl", "csv", "parquet")
+
+# Rows buffered before a Parquet row group is written
+PARQUET_BATCH_ROWS = 10000
+
+
+def rows(location, room, listings):
+    for listing in listings:
+        yield (location, room) + astuple(listing)
+
+
+class JsonLinesWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, location, room, listings):
+        for row in rows(location, room, listings):
+            self.file.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(COLUMNS)
+
+    def write(self, location, room, listings):
+        self.writer.writerows(rows(location, room, listings))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from None
+        self.pa = pa
+        self.schema = pa.schema([
+            ("search_location", pa.string()),
+            ("room", pa.int8()),
+            ("building", pa.string()),
+            ("unit_no", pa.string()),
+            ("price", pa.int64()),
+            ("type", pa.string()),
+            ("size", pa.int32()),
+            ("parking", pa.string()),
+            ("location", pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.buffer = []
+
+    def write(self, location, room, listings):
+        self.buffer.extend(rows(location, room, listings))
+        if len(self.buffer) >= PARQUET_BATCH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        columns = list(zip(*self.buffer))
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema,
+        ))
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+WRITERS = {
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def open_writer(path):
+    # The format comes from the file extension: .jsonl, .csv or .parquet
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension == "json":
+        extension = "jsonl"
+    if extension not in WRITERS:
+        raise ValueError(f"Can't tell the output format of {path!r}, use one of {FORMATS}")
+    return WRITERS[extension](path)